@@ -148,6 +148,15 @@ GOOGLE_MAPS_API_KEY = os.environ.get("GOOGLE_MAPS_API_KEY")
 GOOGLE_MAPS_SERVER_KEY = os.environ.get("GOOGLE_MAPS_SERVER_KEY")
 GOOGLE_MAPS_API_KEY_BACKEND = os.environ.get("GOOGLE_GEOCODING_API_KEY")
 
+# Geocoding backend used by the background worker (python manage.py process_geocode_queue).
+# Use "jobs.geocoding.StubGeocoder" to run offline.
+GEOCODER_BACKEND = os.environ.get("GEOCODER_BACKEND", "jobs.geocoding.GoogleGeocoder")
+# Geocode cache entries (jobs.models.GeocodeCache) are re-resolved after this many days
+GEOCODE_CACHE_TTL_DAYS = 180
+# Uncached geocodes a user may trigger through /jobs/api/geocode/ per window (per process with LocMem)
+GEOCODE_USER_LIMIT = 100
+GEOCODE_USER_WINDOW_SECONDS = 60 * 60
+
 # Resend (Emailing) API Keys
 RESEND_API_KEY = os.environ.get("RESEND_API_KEY", "")
 RESEND_FROM_EMAIL = os.environ.get("RESEND_FROM_EMAIL", "BuzzedIn<no-reply@buzzedinjobs.org>")
@@ -160,6 +169,77 @@ TWILIO_API_KEY_SID = os.environ.get("TWILIO_API_KEY_SID")
 TWILIO_API_KEY_SECRET = os.environ.get("TWILIO_API_KEY_SECRET")
 TWILIO_CONVERSATIONS_SERVICE_SID = os.environ.get("TWILIO_CONVERSATIONS_SERVICE_SID")
 
+# Pooled keep-alive HTTP client for Google Maps calls (jobs.http_client). The retries apply
+# to geocoding; Distance Matrix calls are never retried, so they stay within
+# DISTANCE_MATRIX_DEADLINE_SECONDS.
+GOOGLE_MAPS_HTTP_POOL_SIZE = 10
+GOOGLE_MAPS_HTTP_TIMEOUT = 7.0
+GOOGLE_MAPS_HTTP_RETRIES = 2
+GOOGLE_MAPS_HTTP_BACKOFF = 0.3
+
+# Distance Matrix batching: chunks sent in parallel, and the overall time budget per search
+DISTANCE_MATRIX_MAX_CONCURRENCY = 4
+DISTANCE_MATRIX_DEADLINE_SECONDS = 10.0
+# After this many consecutive Distance Matrix failures, skip straight to the haversine
+# fallback for the cooldown period. Breaker state lives in CACHES["default"], so with the
+# LocMemCache below each process trips on its own; use a shared backend to share it.
+DISTANCE_MATRIX_BREAKER_THRESHOLD = 5
+DISTANCE_MATRIX_BREAKER_COOLDOWN_SECONDS = 60.0
+# Commute cache cells: geohash length for origins and destinations per traffic mode
+# (6 ~ 1.2 km x 0.6 km, 7 ~ 150 m). Shorter hashes share more results, so fewer API
+# calls, at the cost of accuracy; compare settings with manage.py bench_commute_cache.
+COMMUTE_CACHE_PRECISION = {
+    "traffic": {"origin": 6, "destination": 7},
+    "no_traffic": {"origin": 7, "destination": 7},
+}
+# Commute cache entries are served up to this fraction of their TTL past expiry while a
+# background thread refreshes them; TTLs are jittered by +/- COMMUTE_CACHE_TTL_JITTER, and
+# a higher EARLY_REFRESH_BETA refreshes popular entries earlier before they expire.
+COMMUTE_CACHE_STALE_FRACTION = 0.5
+COMMUTE_CACHE_TTL_JITTER = 0.1
+COMMUTE_CACHE_EARLY_REFRESH_BETA = 1.0
+COMMUTE_CACHE_REFRESH_WORKERS = 2
+# How radius searches estimate commutes: "jobs.utils.GoogleCommuteBackend" (Distance Matrix),
+# "jobs.utils.CalibratedCommuteBackend" (offline, learned from past Distance Matrix results)
+# or "jobs.utils.HaversineCommuteBackend" (straight line at 30 mph).
+COMMUTE_BACKEND = os.environ.get("COMMUTE_BACKEND", "jobs.utils.GoogleCommuteBackend")
+# Real results an origin's grid cell needs before the calibrated estimator trusts it
+COMMUTE_CALIBRATION_MIN_SAMPLES = 20
+# Origins most commute searches come from. Road distance/time from these to every job is
+# precomputed by `python manage.py precompute_commutes` (run it periodically, e.g. --loop),
+# and searches starting in the same geohash cell are answered from that table.
+COMMUTE_POPULAR_ORIGINS = [
+    {"name": "Georgia Tech campus", "lat": 33.7756, "lng": -84.3963},
+    {"name": "Downtown (Five Points station)", "lat": 33.7537, "lng": -84.3917},
+    {"name": "Midtown station", "lat": 33.7810, "lng": -84.3864},
+    {"name": "Arts Center station", "lat": 33.7894, "lng": -84.3871},
+    {"name": "Airport station", "lat": 33.6407, "lng": -84.4462},
+]
+COMMUTE_POPULAR_ORIGIN_PRECISION = 6
+
+# Jobs shown per page on the jobs index
+JOBS_PAGE_SIZE = 20
+
+# Full-text job search backend (jobs.search): SQLite FTS5 index, or
+# "jobs.search.SubstringSearchBackend" for unranked icontains matching
+JOB_SEARCH_BACKEND = os.environ.get("JOB_SEARCH_BACKEND", "jobs.search.SQLiteFTSSearchBackend")
+
+# Recommended candidates shown per page (Job.get_recommended_candidates, weighted skill match)
+RECOMMENDATIONS_PAGE_SIZE = 12
+
+# Seconds the jobs index filter counts (jobs.facets) are cached per normalized query
+JOB_FACETS_CACHE_TTL = 300
+
+# Seconds anonymous jobs index pages and map markers are cached per normalized query
+# (jobs.result_cache). Any job or skill change invalidates them earlier in every process:
+# the version in their keys is kept in the database (jobs.models.ResultCacheVersion).
+JOB_RESULTS_CACHE_TTL = 300
+
+# Map marker endpoints (jobs.markers): grid clusters up to this zoom level, individual
+# markers above it unless more than MAP_MAX_MARKERS results are in view
+MAP_CLUSTER_MAX_ZOOM = 13
+MAP_MAX_MARKERS = 500
+
 # Caches for distance matrix
 CACHES = {
     "default": {
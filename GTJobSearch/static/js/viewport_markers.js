@@ -0,0 +1,118 @@
+/*
+ * Map markers for the visible part of the map, loaded from a JSON marker endpoint
+ * (jobs/markers.py) whenever the map settles. Zoomed out, results arrive as grid
+ * clusters, drawn as counted circles that zoom into their area on click.
+ *
+ *   loadViewportMarkers(map, url, {
+ *     params: window.location.search,   // filters forwarded to the endpoint
+ *     fit: true,                         // fit the map to all results on load
+ *     onLoad: (data) => {},              // called with each response before drawing
+ *     createMarker: (m) => marker,       // google.maps.Marker for one result
+ *     onEmpty: () => {},                 // fit found no results with coordinates
+ *   });
+ */
+(function () {
+  function clusterMarker(map, c) {
+    const marker = new google.maps.Marker({
+      position: { lat: c.lat, lng: c.lng },
+      map: map,
+      title: `${c.count} results`,
+      zIndex: 1000 + c.count,
+      label: { text: String(c.count), color: "#ffffff", fontSize: "12px", fontWeight: "600" },
+      icon: {
+        path: google.maps.SymbolPath.CIRCLE,
+        scale: Math.min(28, 13 + 4 * Math.log10(c.count)),
+        fillColor: "#1d4ed8",
+        fillOpacity: 0.85,
+        strokeColor: "#ffffff",
+        strokeWeight: 2
+      }
+    });
+    marker.addListener("click", () => {
+      if (c.south === c.north && c.west === c.east) {
+        map.setCenter({ lat: c.lat, lng: c.lng });
+        map.setZoom(map.getZoom() + 3);
+      } else {
+        map.fitBounds(new google.maps.LatLngBounds(
+          { lat: c.south, lng: c.west }, { lat: c.north, lng: c.east }
+        ));
+      }
+    });
+    return marker;
+  }
+
+  window.loadViewportMarkers = function (map, url, options) {
+    options = options || {};
+    const baseParams = new URLSearchParams(options.params || "");
+    const markerKey = options.markerKey || (m => m.id);
+    let drawn = new Map();  // key -> google.maps.Marker currently on the map
+    let latest = 0;
+    let timer = null;
+
+    function query(extra) {
+      const params = new URLSearchParams(baseParams);
+      Object.entries(extra).forEach(([k, v]) => params.set(k, v));
+      return `${url}?${params.toString()}`;
+    }
+
+    async function load() {
+      const bounds = map.getBounds();
+      if (!bounds) return;
+      const sw = bounds.getSouthWest(), ne = bounds.getNorthEast();
+      const request = ++latest;
+      let data;
+      try {
+        const resp = await fetch(query({
+          south: sw.lat(), west: sw.lng(), north: ne.lat(), east: ne.lng(), zoom: map.getZoom()
+        }), { headers: { "Accept": "application/json" } });
+        data = await resp.json();
+      } catch (e) {
+        return; // keep what is drawn
+      }
+      if (request !== latest || !data.ok) return;  // a newer viewport is loading
+
+      if (options.onLoad) options.onLoad(data);
+
+      // Keep markers that are still in the response so open info windows stay anchored
+      const next = new Map();
+      data.clusters.forEach(c => {
+        const key = `cluster:${c.lat},${c.lng},${c.count}`;
+        next.set(key, drawn.get(key) || clusterMarker(map, c));
+      });
+      data.markers.forEach(m => {
+        const key = `marker:${markerKey(m)}`;
+        const existing = drawn.get(key);
+        const marker = existing || (options.createMarker
+          ? options.createMarker(m)
+          : new google.maps.Marker({ position: { lat: m.lat, lng: m.lng }, map: map }));
+        if (marker) next.set(key, marker);
+      });
+      drawn.forEach((marker, key) => { if (!next.has(key)) marker.setMap(null); });
+      drawn = next;
+    }
+
+    map.addListener("idle", () => {
+      clearTimeout(timer);
+      timer = setTimeout(load, 150);
+    });
+
+    if (options.fit) {
+      fetch(query({ extent: 1 }), { headers: { "Accept": "application/json" } })
+        .then(resp => resp.json())
+        .then(data => {
+          const e = data.ok && data.extent;
+          if (!e) {
+            if (options.onEmpty) options.onEmpty();
+          } else if (e.south === e.north && e.west === e.east) {
+            map.setCenter({ lat: e.south, lng: e.west });
+            map.setZoom(12);
+          } else {
+            map.fitBounds(new google.maps.LatLngBounds(
+              { lat: e.south, lng: e.west }, { lat: e.north, lng: e.east }
+            ));
+          }
+        })
+        .catch(() => {});
+    }
+  };
+})();
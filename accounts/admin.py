@@ -1,34 +1,43 @@
-import csv
-from django.http import HttpResponse
 from django.contrib import admin
+from django.db.models import Prefetch
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from accounts.models import JobSeekerProfile, RecruiterProfile
+from applications.models import Application
+from jobs.exports import export_response, export_rows
+from jobs.models import Job, Skill
 
 admin.site.unregister(User)
 
 
-def export_users_csv(modeladmin, request, queryset):
-    """Export selected users to CSV with role-specific details"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="users_export.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Username', 'Email', 'Role', 'Is Staff', 'Is Active', 
-        'Date Joined', 'Last Login',
-        # Recruiter-specific fields
-        'Company', 'Recruiter Name', 'Website', 'Description', 'Location',
-        'Jobs Posted (Titles)', 'Jobs Posted (Count)',
-        # Job Seeker-specific fields
-        'Headline', 'Skills', 'Education', 'Work Experience', 
-        'Links', 'Projects', 'Applications (Job Titles)', 
-        'Applications (Status)', 'Applications (Count)'
-    ])
-    
-    for user in queryset.select_related('jobseekerprofile', 'recruiterprofile').prefetch_related(
-        'recruiterprofile__jobs', 'applications__job'
-    ):
+USER_EXPORT_COLUMNS = [
+    ("username", "Username"), ("email", "Email"), ("role", "Role"), ("is_staff", "Is Staff"),
+    ("is_active", "Is Active"), ("date_joined", "Date Joined"), ("last_login", "Last Login"),
+    # Recruiter-specific fields
+    ("company", "Company"), ("recruiter_name", "Recruiter Name"), ("website", "Website"),
+    ("description", "Description"), ("location", "Location"),
+    ("jobs_titles", "Jobs Posted (Titles)", " | "), ("jobs_count", "Jobs Posted (Count)"),
+    # Job Seeker-specific fields
+    ("headline", "Headline"), ("skills", "Skills"), ("education", "Education"),
+    ("work_experience", "Work Experience"), ("links", "Links"), ("projects", "Projects"),
+    ("application_titles", "Applications (Job Titles)", " | "),
+    ("application_statuses", "Applications (Status)", " | "), ("applications_count", "Applications (Count)"),
+]
+
+
+def user_export_records(queryset):
+    """
+    Export rows for users with their role-specific details. Profiles are joined and the
+    posted jobs, skills and applications are prefetched per chunk: no per-row queries.
+    """
+    users = queryset.select_related('jobseekerprofile', 'recruiterprofile').prefetch_related(
+        Prefetch('recruiterprofile__jobs', queryset=Job.objects.only('id', 'title', 'recruiter_id')),
+        Prefetch('jobseekerprofile__skills', queryset=Skill.objects.only('name')),
+        Prefetch('applications', queryset=Application.objects.select_related('job').only(
+            'id', 'status', 'user_id', 'job__title',
+        )),
+    )
+    for user in export_rows(users):
         # Determine role
         if user.is_superuser or user.is_staff:
             role = "Admin"
@@ -38,82 +47,65 @@ def export_users_csv(modeladmin, request, queryset):
             role = "Job Seeker"
         else:
             role = "Unassigned"
-        
+
         # Initialize all fields as empty
-        company = recruiter_name = website = description = location = ''
-        jobs_titles = jobs_count = ''
-        headline = skills = education = work_exp = links = projects = ''
-        app_titles = app_status = app_count = ''
-        
+        record = {key: '' for key, *_ in USER_EXPORT_COLUMNS}
+        record.update({
+            'username': user.username,
+            'email': user.email,
+            'role': role,
+            'is_staff': user.is_staff,
+            'is_active': user.is_active,
+            'date_joined': user.date_joined,
+            'last_login': user.last_login,
+        })
+
         # Recruiter-specific data
         if hasattr(user, 'recruiterprofile'):
             recruiter = user.recruiterprofile
-            company = recruiter.company or ''
-            recruiter_name = recruiter.name or ''
-            website = recruiter.website or ''
-            description = recruiter.description or ''
-            location = recruiter.location or ''
-            
-            # Get all jobs posted by this recruiter
-            jobs = recruiter.jobs.all()
-            jobs_count = jobs.count()
-            jobs_titles = ' | '.join([job.title for job in jobs]) if jobs_count > 0 else ''
-        
+            jobs = list(recruiter.jobs.all())
+            record.update({
+                'company': recruiter.company or '',
+                'recruiter_name': recruiter.name or '',
+                'website': recruiter.website or '',
+                'description': recruiter.description or '',
+                'location': (recruiter.location or '') if role == "Recruiter" else '',
+                'jobs_titles': [job.title for job in jobs],
+                'jobs_count': len(jobs),
+            })
+
         # Job Seeker-specific data
         if hasattr(user, 'jobseekerprofile'):
             jobseeker = user.jobseekerprofile
-            headline = jobseeker.headline or ''
-            skills_list = jobseeker.skills.all()
-            skills = ', '.join([skill.name for skill in skills_list])
-            education = jobseeker.education or ''
-            work_exp = jobseeker.work_experience or ''
-            links = jobseeker.links or ''
-            projects = jobseeker.projects or ''
-            location = jobseeker.location or ''
-            
-            # Get all applications by this job seeker
-            applications = user.applications.select_related('job').all()
-            app_count = applications.count()
-            if app_count > 0:
-                app_titles = ' | '.join([app.job.title for app in applications])
-                app_status = ' | '.join([f"{app.job.title}: {app.status}" for app in applications])
-            else:
-                app_titles = ''
-                app_status = ''
-        
-        writer.writerow([
-            user.username,
-            user.email,
-            role,
-            user.is_staff,
-            user.is_active,
-            user.date_joined.strftime('%Y-%m-%d %H:%M:%S') if user.date_joined else '',
-            user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else '',
-            # Recruiter fields
-            company,
-            recruiter_name,
-            website,
-            description,
-            location if role == "Recruiter" else '',
-            jobs_titles,
-            jobs_count,
-            # Job Seeker fields
-            headline,
-            skills,
-            education,
-            work_exp,
-            links,
-            projects,
-            app_titles,
-            app_status,
-            app_count,
-        ])
-    
-    return response
+            applications = list(user.applications.all())
+            record.update({
+                'headline': jobseeker.headline or '',
+                'skills': [skill.name for skill in jobseeker.skills.all()],
+                'education': jobseeker.education or '',
+                'work_experience': jobseeker.work_experience or '',
+                'links': jobseeker.links or '',
+                'projects': jobseeker.projects or '',
+                'application_titles': [app.job.title for app in applications],
+                'application_statuses': [f"{app.job.title}: {app.status}" for app in applications],
+                'applications_count': len(applications),
+            })
+        yield record
+
+
+def export_users_csv(modeladmin, request, queryset):
+    """Export selected users to CSV with role-specific details (streamed)"""
+    return export_response(user_export_records(queryset), USER_EXPORT_COLUMNS, "users_export")
 
 export_users_csv.short_description = "Export selected users to CSV"
 
 
+def export_users_ndjson(modeladmin, request, queryset):
+    """Export selected users as newline-delimited JSON with role-specific details (streamed)"""
+    return export_response(user_export_records(queryset), USER_EXPORT_COLUMNS, "users_export", fmt="ndjson")
+
+export_users_ndjson.short_description = "Export selected users to NDJSON"
+
+
 @admin.register(User)
 class GroupedUserAdmin(DjangoUserAdmin):
     list_display = ("username", "email", "is_staff", "user_role")
@@ -123,7 +115,7 @@ class GroupedUserAdmin(DjangoUserAdmin):
     change_list_template = "admin/auth/user/change_list.html"
     
     # Enable actions and specify which ones to show
-    actions = ['delete_selected', 'export_users_csv']
+    actions = ['delete_selected', 'export_users_csv', 'export_users_ndjson']
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -208,12 +200,12 @@ class GroupedUserAdmin(DjangoUserAdmin):
     def get_actions(self, request):
         """Override to show delete and export actions"""
         actions = super().get_actions(request)
-        # Add our custom export action
-        actions['export_users_csv'] = (export_users_csv, 'export_users_csv', export_users_csv.short_description)
+        # Add our custom export actions
+        exports = {
+            action.__name__: (action, action.__name__, action.short_description)
+            for action in (export_users_csv, export_users_ndjson)
+        }
         # Keep only the delete_selected and export actions
         if 'delete_selected' in actions:
-            return {
-                'delete_selected': actions['delete_selected'],
-                'export_users_csv': actions['export_users_csv']
-            }
-        return {'export_users_csv': actions['export_users_csv']}
\ No newline at end of file
+            return {'delete_selected': actions['delete_selected'], **exports}
+        return exports
\ No newline at end of file
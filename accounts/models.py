@@ -38,6 +38,27 @@ class AddressFields(models.Model):
         ]
         return ", ".join([p.strip() for p in parts if p.strip()])
 
+    @property
+    def geocode_query(self):
+        """Address text used to look up coordinates for this profile."""
+        return getattr(self, "location", None) or self.full_address
+
+    def save(self, *args, **kwargs):
+        # Missing coordinates are filled from the shared geocode cache (jobs.models.GeocodeCache)
+        # only; unknown addresses are geocoded by the background worker after the save.
+        queue_geocode = False
+        if not self.has_geo and kwargs.get("update_fields") is None and self.geocode_query:
+            from jobs.models import GeocodeCache
+            found, coords = GeocodeCache.lookup(self.geocode_query)
+            if coords is not None:
+                self.latitude, self.longitude = coords
+            queue_geocode = not found
+        super().save(*args, **kwargs)
+
+        if queue_geocode:
+            from jobs.models import GeocodeTask
+            GeocodeTask.enqueue(self)
+
 
 class JobSeekerProfile(AddressFields):
     PRIVACY_CHOICES = [
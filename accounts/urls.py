@@ -17,5 +17,6 @@ urlpatterns = [
     path("view/<int:user_id>/", views.view_profile, name="view_profile"),
     path("view/<int:user_id>/contact/", contact_user_view, name="contact_user"),  # <-- use communication view
     path("connect/", views.connect, name="connect"),
+    path("connect/markers/", views.connect_markers, name="connect_markers"),
     path('api/skills/create/', views.create_skill, name='create_skill'),
 ]
@@ -15,6 +15,7 @@ import json
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from jobs.models import Skill
+from jobs.markers import markers_response, within_radius
 from communication.models import Connection
 
 from .forms import (
@@ -434,19 +435,11 @@ def contact_user(request, user_id: int):
     return redirect("accounts:view_profile", user_id=user_id)
 
 # ---------- CONNECT PAGE (view other users) ----------
-@login_required
-def connect(request):
-    user = request.user
+def connect_querysets(user, params):
+    """Job seeker and recruiter profiles shown to `user` on the connect page for the q/role params."""
     viewer_is_recruiter = hasattr(user, "recruiterprofile")
-
-    q = request.GET.get("q", "").strip()
-    role = request.GET.get("role", "").strip()           # "", "jobseeker", "recruiter"
-    page = request.GET.get("page", "1")
-    # location + radius come from the UI; server side distance filter is optional (we'll do client-side geofilter today)
-    loc = request.GET.get("location", "").strip()
-    radius = request.GET.get("radius", "").strip()
-    lat = request.GET.get("lat", "").strip()
-    lng = request.GET.get("lng", "").strip()
+    q = params.get("q", "").strip()
+    role = params.get("role", "").strip()           # "", "jobseeker", "recruiter"
 
     # --- Job Seekers ---
     js_qs = JobSeekerProfile.objects.select_related("user").prefetch_related("skills")
@@ -479,6 +472,60 @@ def connect(request):
     elif role == "recruiter":
         js_qs = JobSeekerProfile.objects.none()
 
+    return js_qs, recruiters_qs
+
+
+def connect_marker(p):
+    """Map marker for a job seeker or recruiter profile on the connect page."""
+    is_recruiter = isinstance(p, RecruiterProfile)
+    if is_recruiter:
+        headline = f"Recruiter at {p.company}" if p.company else "Recruiter"
+    else:
+        headline = p.headline or ""
+    return {
+        "id": p.user_id,
+        "name": p.user.username,
+        "role": "recruiter" if is_recruiter else "jobseeker",
+        "headline": headline,
+        "email": p.user.email,
+        "location_text": getattr(p, "location", "") or "",
+        "lat": float(p.latitude),
+        "lng": float(p.longitude),
+        "profileUrl": reverse("accounts:view_profile", args=[p.user_id]),
+        "contactUrl": reverse("accounts:contact_user", args=[p.user_id]),
+        "profilePicture": p.profile_picture.url if p.profile_picture else None,
+    }
+
+
+# Map markers for the connect page viewport (same q/role filters; optional lat/lng/radius in miles)
+@login_required
+def connect_markers(request):
+    js_qs, recruiters_qs = connect_querysets(request.user, request.GET)
+    try:
+        origin = (float(request.GET["lat"]), float(request.GET["lng"]), float(request.GET["radius"]))
+    except (KeyError, ValueError):
+        origin = None
+    if origin is not None and origin[2] > 0:
+        js_qs = within_radius(js_qs, *origin)
+        recruiters_qs = within_radius(recruiters_qs, *origin)
+    return markers_response(request, [(js_qs, connect_marker), (recruiters_qs, connect_marker)])
+
+
+@login_required
+def connect(request):
+    user = request.user
+
+    q = request.GET.get("q", "").strip()
+    role = request.GET.get("role", "").strip()           # "", "jobseeker", "recruiter"
+    page = request.GET.get("page", "1")
+    # location + radius come from the UI; server side distance filter is optional (we'll do client-side geofilter today)
+    loc = request.GET.get("location", "").strip()
+    radius = request.GET.get("radius", "").strip()
+    lat = request.GET.get("lat", "").strip()
+    lng = request.GET.get("lng", "").strip()
+
+    js_qs, recruiters_qs = connect_querysets(user, request.GET)
+
     # Map to lightweight dicts for cards + markers.
     def map_jobseeker(p):
         skill_names = ", ".join(p.skills.values_list("name", flat=True))
@@ -555,29 +602,11 @@ def connect(request):
     for item in page_obj.object_list:
         item["connection_relation"] = connection_map.get(item["id"])
 
-    # Markers for all (not just current page) so the map shows the full picture
-    user_markers = []
-    for it in items:
-        user_markers.append({
-            "id": it["id"],
-            "name": it["username"],
-            "role": it["profile_type"],
-            "headline": it["headline"],
-            "email": it["email"],
-            "location_text": it["location_text"],
-            "lat": it["lat"],
-            "lng": it["lng"],
-            "profileUrl": reverse("accounts:view_profile", args=[it["id"]]),
-            "contactUrl": reverse("accounts:contact_user", args=[it["id"]]),
-            "profilePicture": it.get("profile_picture"),
-        })
-
     return render(request, "accounts/connect.html", {
         "page_obj": page_obj,
         "q": q,
         "role": role,
         "MAPS_KEY": settings.GOOGLE_MAPS_API_KEY,
-        "user_markers_json": json.dumps(user_markers),
         "lat": lat,
         "lng": lng,
         "radius": radius,
@@ -1,33 +1,43 @@
-import csv
 from django.contrib import admin
-from django.http import HttpResponse
 from applications.models import Application
+from jobs.exports import export_response, export_rows
 
 
+APPLICATION_EXPORT_COLUMNS = [
+    ("id", "ID"), ("user", "User"), ("job_title", "Job Title"), ("company", "Company"),
+    ("status", "Status"), ("applied_at", "Applied At"), ("note", "Note"),
+]
+
+
+def application_export_records(queryset):
+    """Export rows for applications (user and job joined in the same query)."""
+    applications = queryset.select_related("user", "job").only(
+        "id", "status", "applied_at", "note", "user__username", "job__title", "job__company",
+    )
+    for app in export_rows(applications):
+        yield {
+            "id": app.id,
+            "user": app.user.username,
+            "job_title": app.job.title,
+            "company": app.job.company,
+            "status": app.status,
+            "applied_at": app.applied_at,
+            "note": app.note or "",
+        }
+
+
+@admin.action(description="Export selected applications to CSV")
 def export_applications_csv(modeladmin, request, queryset):
-    """Export selected applications to CSV"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="applications_export.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'ID', 'User', 'Job Title', 'Company', 'Status', 'Applied At', 'Note'
-    ])
-    
-    for app in queryset.select_related('user', 'job'):
-        writer.writerow([
-            app.id,
-            app.user.username,
-            app.job.title,
-            app.job.company,
-            app.status,
-            app.applied_at.strftime('%Y-%m-%d %H:%M:%S'),
-            app.note or '',
-        ])
-    
-    return response
-
-export_applications_csv.short_description = "Export selected applications to CSV"
+    """Export selected applications to CSV (streamed)"""
+    return export_response(application_export_records(queryset), APPLICATION_EXPORT_COLUMNS, "applications_export")
+
+
+@admin.action(description="Export selected applications to NDJSON")
+def export_applications_ndjson(modeladmin, request, queryset):
+    """Export selected applications as newline-delimited JSON (streamed)"""
+    return export_response(
+        application_export_records(queryset), APPLICATION_EXPORT_COLUMNS, "applications_export", fmt="ndjson",
+    )
 
 
 @admin.register(Application)
@@ -35,4 +45,4 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('user', 'job', 'status', 'applied_at')
     list_filter = ('status', 'applied_at')
     search_fields = ('user__username', 'job__title', 'job__company')
-    actions = [export_applications_csv]  # Changed from string to function reference
\ No newline at end of file
+    actions = [export_applications_csv, export_applications_ndjson]
\ No newline at end of file
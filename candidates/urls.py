@@ -6,6 +6,7 @@ app_name = 'candidates'
 
 urlpatterns = [
     path('search/', views.search_candidates, name='search_candidates'),
+    path('search/markers/', views.candidate_markers, name='candidate_markers'),
     path("recommendations/", views.recommended_candidates, name="recommended_candidates"),
     
     # Filter endpoints
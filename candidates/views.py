@@ -1,22 +1,19 @@
 from django.shortcuts import render, get_object_or_404
-from django.db.models import Q, Count
+from django.conf import settings
+from django.db.models import Q
 from django.urls import reverse
 from accounts.models import JobSeekerProfile, RecruiterProfile  
 from jobs.models import Skill
 from django.contrib.auth.decorators import login_required
 from jobs.models import Job
-import json, os
+from jobs.markers import markers_response, within_radius
+import os
 
-# Show all public/visible candidates, filter by skill, location, projects (TextField)
-def search_candidates(request):
-    skill_query = (request.GET.get('skill') or "").strip()
-    location_query = (request.GET.get('location') or "").strip()
-    project_query = (request.GET.get('project') or "").strip()
-    
-    # Get lat/lng and radius from request
-    lat = request.GET.get('lat', '').strip()
-    lng = request.GET.get('lng', '').strip()
-    radius = request.GET.get('radius', '').strip()
+def filter_candidates(params):
+    """Visible job seeker profiles matching the skill/location/project params of the candidate search."""
+    skill_query = (params.get('skill') or "").strip()
+    location_query = (params.get('location') or "").strip()
+    project_query = (params.get('project') or "").strip()
 
     # Only candidates who are visible to recruiters
     candidates = (
@@ -41,41 +38,28 @@ def search_candidates(request):
     # Avoid duplicates if multiple skills match
     candidates = candidates.distinct()
 
+    return candidates
+
+
+# Show all public/visible candidates, filter by skill, location, projects (TextField)
+def search_candidates(request):
+    skill_query = (request.GET.get('skill') or "").strip()
+    location_query = (request.GET.get('location') or "").strip()
+    project_query = (request.GET.get('project') or "").strip()
+    
+    # Get lat/lng and radius from request
+    lat = request.GET.get('lat', '').strip()
+    lng = request.GET.get('lng', '').strip()
+    radius = request.GET.get('radius', '').strip()
+
+    candidates = filter_candidates(request.GET)
+
     skills = Skill.objects.all().order_by('name')
 
     print("DEBUG: Candidates found =", candidates.count())
     for c in candidates:
         print(" -", c.user.username, "| privacy:", c.privacy, "| location:", c.location)
 
-    # Build candidate markers for map
-    candidate_markers = []
-    for candidate in candidates:
-        marker_data = {
-            'id': candidate.user.id,
-            'name': candidate.user.username,
-            'location': candidate.location or '',
-            'headline': candidate.headline or '',
-            'skills': ', '.join([s.name for s in candidate.skills.all()[:3]]),
-            'profileUrl': reverse('accounts:view_profile', args=[candidate.user.id]),
-            'profilePicture': candidate.profile_picture.url if candidate.profile_picture else '',
-        }
-        
-        # Add lat/lng if available (from AddressFields)
-        if candidate.latitude is not None and candidate.longitude is not None:
-            marker_data['lat'] = float(candidate.latitude)
-            marker_data['lng'] = float(candidate.longitude)
-        
-        # Determine connection status for Connect button
-        if request.user.is_authenticated and request.user.id != candidate.user.id:
-            # Check connection relation (you'll need to add this logic based on your Connection model)
-            # For now, we'll just add a connectUrl
-            marker_data['connectUrl'] = reverse('communication:connections_request', 
-                                               kwargs={'user_id': candidate.user.id})
-        else:
-            marker_data['connectUrl'] = ''
-            
-        candidate_markers.append(marker_data)
-
     recommended = None
     selected_job = None
     recruiter_jobs = None
@@ -93,19 +77,10 @@ def search_candidates(request):
             ).first()
 
             if selected_job:
-                # 🔹 Use required_skills + preferred_skills instead of job.skills
-                required_qs = selected_job.required_skills.all()
-                preferred_qs = selected_job.preferred_skills.all()
-                job_skills = (required_qs | preferred_qs).distinct()
-
-                # 🔹 Match JobSeekerProfile.skills (M2M to jobs.Skill)
-                recommended = (
-                    JobSeekerProfile.objects
-                    .filter(privacy__in=['public', 'employers_only'])
-                    .filter(skills__in=job_skills)
-                    .select_related('user')
-                    .prefetch_related('skills')
-                    .distinct()
+                # 🔹 Top matches by weighted required/preferred skill overlap
+                visible = JobSeekerProfile.objects.filter(privacy__in=['public', 'employers_only'])
+                recommended, _ = selected_job.recommended_candidates_page(
+                    page_size=getattr(settings, "RECOMMENDATIONS_PAGE_SIZE", 12), candidates=visible,
                 )
 
     return render(request, 'candidates/search.html', {
@@ -120,11 +95,45 @@ def search_candidates(request):
         'recruiter_jobs': recruiter_jobs,
         'selected_job': selected_job,
         'recommended': recommended,
-        'candidate_markers_json': json.dumps(candidate_markers),
         'MAPS_KEY': os.environ.get('GOOGLE_MAPS_API_KEY', ''),
     })
 
 
+def candidate_marker(candidate, viewer=None):
+    """Map marker for one candidate on the candidate search map."""
+    marker_data = {
+        'id': candidate.user.id,
+        'name': candidate.user.username,
+        'location': candidate.location or '',
+        'headline': candidate.headline or '',
+        'skills': ', '.join([s.name for s in candidate.skills.all()[:3]]),
+        'profileUrl': reverse('accounts:view_profile', args=[candidate.user.id]),
+        'profilePicture': candidate.profile_picture.url if candidate.profile_picture else '',
+        'lat': float(candidate.latitude),
+        'lng': float(candidate.longitude),
+    }
+
+    # Determine connection status for Connect button
+    if viewer is not None and viewer.is_authenticated and viewer.id != candidate.user.id:
+        marker_data['connectUrl'] = reverse('communication:connections_request',
+                                           kwargs={'user_id': candidate.user.id})
+    else:
+        marker_data['connectUrl'] = ''
+    return marker_data
+
+
+# Map markers for the candidate search viewport (same filters; optional lat/lng/radius in miles)
+def candidate_markers(request):
+    candidates = filter_candidates(request.GET)
+    try:
+        origin = (float(request.GET['lat']), float(request.GET['lng']), float(request.GET['radius']))
+    except (KeyError, ValueError):
+        origin = None
+    if origin is not None and origin[2] > 0:
+        candidates = within_radius(candidates, *origin)
+    return markers_response(request, [(candidates, lambda c: candidate_marker(c, request.user))])
+
+
 @login_required
 def recommended_candidates(request):
     recruiter = getattr(request.user, "recruiterprofile", None)
@@ -143,14 +152,8 @@ def recommended_candidates(request):
     if selected_job_id:
         selected_job = get_object_or_404(Job, id=selected_job_id, recruiter=recruiter)
 
-        job_skills = selected_job.skills.all()
-
-        recommended = (
-            JobSeekerProfile.objects
-            .filter(skills__in=job_skills)
-            .distinct()
-            .annotate(matches=Count('skills'))
-            .order_by('-matches')
+        recommended = selected_job.get_recommended_candidates(
+            limit=getattr(settings, "RECOMMENDATIONS_PAGE_SIZE", 12),
         )
 
     return render(request, "candidates/recommended_candidates.html", {
@@ -1,49 +1,56 @@
-import csv
 from django.contrib import admin
-from django.http import HttpResponse
-from .models import Job, Skill
+from django.db.models import Prefetch
+from .exports import export_response, export_rows
+from .models import CommuteCalibration, GeocodeCache, GeocodeTask, Job, JobCandidateMatch, PrecomputedCommute, Skill
 
 
+JOB_EXPORT_COLUMNS = [
+    ("id", "ID"), ("title", "Title"), ("company", "Company"), ("location", "Location"),
+    ("recruiter", "Recruiter"), ("pay_min", "Pay Min"), ("pay_max", "Pay Max"), ("pay_type", "Pay Type"),
+    ("visa_sponsorship", "Visa Sponsorship"), ("is_approved", "Is Approved"), ("is_flagged", "Is Flagged"),
+    ("is_archived", "Is Archived"), ("created_at", "Created At"), ("description", "Description"),
+    ("required_skills", "Required Skills"), ("preferred_skills", "Preferred Skills"),
+]
+
+
+def job_export_records(queryset):
+    """Export rows for jobs; skills are prefetched per chunk, so there are no per-row queries."""
+    skill_names = Skill.objects.only("name")
+    jobs = queryset.select_related("recruiter").prefetch_related(
+        Prefetch("required_skills", queryset=skill_names),
+        Prefetch("preferred_skills", queryset=skill_names),
+    )
+    for job in export_rows(jobs):
+        yield {
+            "id": job.id,
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "recruiter": job.recruiter.name if job.recruiter else "N/A",
+            "pay_min": job.pay_min,
+            "pay_max": job.pay_max,
+            "pay_type": job.pay_type,
+            "visa_sponsorship": job.visa_sponsorship,
+            "is_approved": job.is_approved,
+            "is_flagged": job.is_flagged,
+            "is_archived": job.is_archived,
+            "created_at": job.created_at,
+            "description": job.description,
+            "required_skills": [skill.name for skill in job.required_skills.all()],
+            "preferred_skills": [skill.name for skill in job.preferred_skills.all()],
+        }
+
+
+@admin.action(description="Export selected jobs to CSV")
 def export_jobs_csv(modeladmin, request, queryset):
-    """Export selected jobs to CSV"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="jobs_export.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'ID', 'Title', 'Company', 'Location', 'Recruiter', 
-        'Pay Min', 'Pay Max', 'Pay Type', 'Visa Sponsorship',
-        'Is Approved', 'Is Flagged', 'Is Archived', 'Created At',
-        'Description', 'Required Skills', 'Preferred Skills'
-    ])
-    
-    for job in queryset.select_related('recruiter'):
-        required_skills = ', '.join([skill.name for skill in job.required_skills.all()])
-        preferred_skills = ', '.join([skill.name for skill in job.preferred_skills.all()])
-        recruiter_name = job.recruiter.name if job.recruiter else 'N/A'
-        
-        writer.writerow([
-            job.id,
-            job.title,
-            job.company,
-            job.location,
-            recruiter_name,
-            job.pay_min,
-            job.pay_max,
-            job.pay_type,
-            job.visa_sponsorship,
-            job.is_approved,
-            job.is_flagged,
-            job.is_archived,
-            job.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            job.description,  # Added description
-            required_skills,
-            preferred_skills,
-        ])
-    
-    return response
-
-export_jobs_csv.short_description = "Export selected jobs to CSV"
+    """Export selected jobs to CSV (streamed)"""
+    return export_response(job_export_records(queryset), JOB_EXPORT_COLUMNS, "jobs_export")
+
+
+@admin.action(description="Export selected jobs to NDJSON")
+def export_jobs_ndjson(modeladmin, request, queryset):
+    """Export selected jobs as newline-delimited JSON (streamed)"""
+    return export_response(job_export_records(queryset), JOB_EXPORT_COLUMNS, "jobs_export", fmt="ndjson")
 
 
 @admin.register(Job)
@@ -53,7 +60,7 @@ class JobAdmin(admin.ModelAdmin):
     search_fields = ("title", "company", "description")
 
     # Add export action to your existing actions
-    actions = ["approve_jobs", "flag_jobs", "archive_jobs", export_jobs_csv]
+    actions = ["approve_jobs", "flag_jobs", "archive_jobs", export_jobs_csv, export_jobs_ndjson]
 
     @admin.action(description="Approve selected jobs")
     def approve_jobs(self, request, queryset):
@@ -72,4 +79,52 @@ class JobAdmin(admin.ModelAdmin):
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ('name',)
-    search_fields = ('name',)
\ No newline at end of file
+    search_fields = ('name',)
+
+
+@admin.register(GeocodeTask)
+class GeocodeTaskAdmin(admin.ModelAdmin):
+    list_display = ("target", "location", "status", "attempts", "next_attempt_at", "last_error")
+    list_filter = ("status",)
+    search_fields = ("location", "job__title", "jobseeker__user__username", "recruiter__name")
+    raw_id_fields = ("job", "jobseeker", "recruiter")
+    list_select_related = ("job", "jobseeker__user", "recruiter")
+    actions = ["retry_tasks"]
+
+    @admin.action(description="Retry selected geocoding tasks")
+    def retry_tasks(self, request, queryset):
+        for task in queryset.select_related("job", "jobseeker", "recruiter"):
+            if task.target is not None:
+                GeocodeTask.enqueue(task.target, force=True)
+
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    list_display = ("address_key", "latitude", "longitude", "hit_count", "miss_count", "resolved_at")
+    search_fields = ("address_key", "address")
+
+
+@admin.register(CommuteCalibration)
+class CommuteCalibrationAdmin(admin.ModelAdmin):
+    list_display = ("grid_lat", "grid_lng", "samples", "circuity", "mph", "traffic_samples", "updated_at")
+    ordering = ("-samples",)
+
+    def circuity(self, obj):
+        return round(obj.road_miles / obj.straight_miles, 2) if obj.straight_miles else None
+
+    def mph(self, obj):
+        return round(obj.road_miles / (obj.minutes / 60.0), 1) if obj.minutes else None
+
+
+@admin.register(PrecomputedCommute)
+class PrecomputedCommuteAdmin(admin.ModelAdmin):
+    list_display = ("origin_cell", "job", "distance_miles", "duration_in_traffic_minutes", "computed_at")
+    list_filter = ("origin_cell",)
+    raw_id_fields = ("job",)
+
+
+@admin.register(JobCandidateMatch)
+class JobCandidateMatchAdmin(admin.ModelAdmin):
+    list_display = ("job", "candidate", "score", "required_matches", "preferred_matches")
+    ordering = ("job", "-score")
+    raw_id_fields = ("job", "candidate")
@@ -5,6 +5,9 @@ class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
 
+    def ready(self):
+        import jobs.signals  # noqa
+
     # Commented out ready due to a bunch of issues
 #    def ready(self):
 #        from .models import Skill
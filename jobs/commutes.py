@@ -0,0 +1,106 @@
+# Precomputed commutes from popular origins (campus, downtown, transit hubs) to every job
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Job, PrecomputedCommute
+from .utils import batch_road_distance_and_time, estimate_commutes, geohash
+
+PRECOMPUTE_BATCH_SIZE = 500
+
+
+def popular_origins():
+    """[(name, lat, lng, cell)] for settings.COMMUTE_POPULAR_ORIGINS."""
+    precision = getattr(settings, "COMMUTE_POPULAR_ORIGIN_PRECISION", 6)
+    return [
+        (origin["name"], origin["lat"], origin["lng"], geohash(origin["lat"], origin["lng"], precision))
+        for origin in getattr(settings, "COMMUTE_POPULAR_ORIGINS", [])
+    ]
+
+
+def popular_origin_cell(lat, lng):
+    """The cell of the popular origin whose cell contains lat/lng, or None."""
+    precision = getattr(settings, "COMMUTE_POPULAR_ORIGIN_PRECISION", 6)
+    cell = geohash(lat, lng, precision)
+    for _, _, _, origin_cell in popular_origins():
+        if origin_cell == cell:
+            return cell
+    return None
+
+
+def precompute_commutes(names=None, max_age=timedelta(hours=24), batch_size=PRECOMPUTE_BATCH_SIZE):
+    """
+    Fill PrecomputedCommute rows for each popular origin (or just those in `names`):
+    geocoded jobs with no row for their current coordinates, or a row older than max_age.
+    Only Distance Matrix answers are stored; fallbacks are retried on the next run.
+    Returns {origin name: rows written}.
+    """
+    written = {}
+    fresh_after = timezone.now() - max_age if max_age else None
+    for name, lat, lng, cell in popular_origins():
+        if names and name not in names:
+            continue
+        current = PrecomputedCommute.objects.filter(
+            origin_cell=cell, job=OuterRef("pk"),
+            dest_lat=OuterRef("latitude"), dest_lng=OuterRef("longitude"),
+        )
+        if fresh_after is not None:
+            current = current.filter(computed_at__gte=fresh_after)
+        todo = list(
+            Job.objects.exclude(latitude=None).exclude(longitude=None)
+            .exclude(Exists(current))
+            .order_by("id")
+            .values_list("id", "latitude", "longitude")
+        )
+
+        written[name] = 0
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start + batch_size]
+            results = batch_road_distance_and_time(lat, lng, [(jlat, jlng, job_id) for (job_id, jlat, jlng) in batch])
+            now = timezone.now()
+            rows = [
+                PrecomputedCommute(
+                    origin_cell=cell, job_id=job_id, dest_lat=jlat, dest_lng=jlng,
+                    distance_miles=results[job_id]["distance_miles"],
+                    duration_minutes=results[job_id]["duration_minutes"],
+                    duration_in_traffic_minutes=results[job_id]["duration_in_traffic_minutes"],
+                    computed_at=now,
+                )
+                for (job_id, jlat, jlng) in batch
+                if results.get(job_id, {}).get("status") == "OK"
+            ]
+            PrecomputedCommute.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["origin_cell", "job"],
+                update_fields=["dest_lat", "dest_lng", "distance_miles", "duration_minutes",
+                               "duration_in_traffic_minutes", "computed_at"],
+            )
+            written[name] += len(rows)
+    return written
+
+
+def job_commutes(origin_lat, origin_lng, jobs, *, use_traffic=True, traffic_model="best_guess"):
+    """
+    Commute results {job.pk: result} for jobs with coordinates. Searches from a popular
+    origin are answered from PrecomputedCommute; only jobs without a row for their
+    current coordinates go to the commute backend (jobs.utils.estimate_commutes).
+    """
+    jobs = [job for job in jobs if job.latitude is not None and job.longitude is not None]
+    results = {}
+
+    cell = popular_origin_cell(origin_lat, origin_lng)
+    if cell is not None and jobs:
+        coords = {job.pk: (job.latitude, job.longitude) for job in jobs}
+        for row in PrecomputedCommute.objects.filter(origin_cell=cell, job_id__in=list(coords)):
+            if coords[row.job_id] == (row.dest_lat, row.dest_lng):
+                results[row.job_id] = row.as_result()
+
+    rest = [(job.latitude, job.longitude, job.pk) for job in jobs if job.pk not in results]
+    if rest:
+        results.update(estimate_commutes(
+            origin_lat, origin_lng, rest, use_traffic=use_traffic, traffic_model=traffic_model
+        ))
+    return results
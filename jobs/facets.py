@@ -0,0 +1,101 @@
+# Facet counts for the jobs index filters: two queries per search, cached per query
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Q
+
+from .models import PAY_TYPE_CHOICES, Job, Skill
+from .result_cache import cached_query
+
+# Query params that change the filtered set (pagination and sort do not)
+FACET_PARAMS = ("search", "pay_type", "min_salary", "max_salary", "visa", "skills", "location", "lat", "lng", "radius")
+
+# Buckets of Job.annual_pay_min (yearly starting pay): (label, low, high); high is exclusive, None is open
+SALARY_BUCKETS = [
+    ("Under $50k", None, 50_000),
+    ("$50k–$75k", 50_000, 75_000),
+    ("$75k–$100k", 75_000, 100_000),
+    ("$100k–$150k", 100_000, 150_000),
+    ("$150k+", 150_000, None),
+]
+TOP_SKILLS = 10
+
+
+def _bucket_q(low, high):
+    q = Q()
+    if low is not None:
+        q &= Q(annual_pay_min__gte=low)
+    if high is not None:
+        q &= Q(annual_pay_min__lt=high)
+    return q
+
+
+def compute_facets(jobs, pay_type=None):
+    """
+    Facet counts for the jobs index: one aggregate query for the total, pay types, visa
+    sponsorship and salary buckets, and one for the top skills (with their names).
+
+    `jobs` is the filtered set *without* the pay type filter and `pay_type` the selected
+    pay type (or None), so the pay type counts show what each choice would return while
+    every other count applies the selection.
+    """
+    selected = Q(pay_type=pay_type) if pay_type else Q()
+    # Re-base on the primary key so joins/distinct() in the filtered query don't skew the counts
+    rows = Job.objects.filter(pk__in=jobs.values("pk")).order_by()
+    aggregates = {
+        "total": Count("pk", filter=selected),
+        "visa": Count("pk", filter=selected & Q(visa_sponsorship=True)),
+    }
+    for value, _ in PAY_TYPE_CHOICES:
+        aggregates[f"pay_{value}"] = Count("pk", filter=Q(pay_type=value))
+    for i, (_, low, high) in enumerate(SALARY_BUCKETS):
+        aggregates[f"salary_{i}"] = Count("pk", filter=selected & _bucket_q(low, high))
+    counts = rows.aggregate(**aggregates)
+
+    return {
+        "total": counts["total"],
+        "pay_type": [
+            {"value": value, "label": label, "count": counts[f"pay_{value}"]}
+            for value, label in PAY_TYPE_CHOICES
+        ],
+        "visa": counts["visa"],
+        "salary": [
+            {"label": label, "min": low, "max": high, "count": counts[f"salary_{i}"]}
+            for i, (label, low, high) in enumerate(SALARY_BUCKETS)
+        ],
+        "skills": top_skills(jobs.filter(selected)) if counts["total"] else [],
+    }
+
+
+def top_skills(jobs, limit=TOP_SKILLS):
+    """[{"name", "count"}] for the skills most often required or preferred by the jobs in `jobs`."""
+    job_ids, params = jobs.order_by().values("pk").query.sql_with_params()
+    required = Job.required_skills.through._meta
+    preferred = Job.preferred_skills.through._meta
+    name_column = Skill._meta.get_field("name").column
+    qn = connection.ops.quote_name
+    # A job listing a skill as both required and preferred counts once (UNION removes the duplicate pair)
+    sql = f"""
+        SELECT skill.{qn(name_column)}, COUNT(*) AS jobs FROM (
+            SELECT job_id, skill_id FROM {qn(required.db_table)} WHERE job_id IN ({job_ids})
+            UNION
+            SELECT job_id, skill_id FROM {qn(preferred.db_table)} WHERE job_id IN ({job_ids})
+        ) AS pairs
+        JOIN {qn(Skill._meta.db_table)} skill ON skill.{qn(Skill._meta.pk.column)} = pairs.skill_id
+        GROUP BY pairs.skill_id, skill.{qn(name_column)}
+        ORDER BY jobs DESC, pairs.skill_id
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, *params, limit])
+        return [{"name": name, "count": n} for name, n in cursor.fetchall()]
+
+
+def job_facets(params, jobs, pay_type=None):
+    """
+    compute_facets(jobs, pay_type) for the jobs index query `params`, cached for
+    settings.JOB_FACETS_CACHE_TTL seconds per normalized query and jobs version.
+    """
+    return cached_query(
+        "job-facets", params, lambda: compute_facets(jobs, pay_type),
+        getattr(settings, "JOB_FACETS_CACHE_TTL", 300), names=FACET_PARAMS,
+    )
@@ -1,5 +1,6 @@
 # jobs/forms.py
 from django import forms
+from django.core.validators import MinValueValidator
 from .models import Job
 
 class JobForm(forms.ModelForm):
@@ -35,9 +36,11 @@ class JobForm(forms.ModelForm):
             widget=forms.HiddenInput(),
         )
 
-        # ✅ Non-negative pay fields
-        self.fields['pay_min'].min_value = 0
-        self.fields['pay_max'].min_value = 0
+        # ✅ Non-negative pay fields (min_value alone has no effect after the field is built)
+        for name in ('pay_min', 'pay_max'):
+            self.fields[name].min_value = 0
+            self.fields[name].validators.append(MinValueValidator(0))
+            self.fields[name].widget.attrs['min'] = 0
 
         # ✅ Add placeholders for UX
         self.fields['title'].widget.attrs.update({
@@ -0,0 +1,223 @@
+# Background geocoding for job locations and profile addresses
+import hashlib
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .http_client import MapsHTTPError, maps_get
+from .models import GeocodeCache, GeocodeTask
+from .utils import normalize_address
+
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+MAX_ATTEMPTS = 5
+BASE_RETRY_SECONDS = 30
+MAX_RETRY_SECONDS = 60 * 60
+# How long a claimed batch stays invisible to other workers
+CLAIM_LEASE_SECONDS = 5 * 60
+
+
+class GeocodingError(Exception):
+    """Transient geocoding failure; the task will be retried."""
+
+
+class GoogleGeocoder:
+    """Resolves addresses with the Google Geocoding API."""
+
+    def __init__(self, api_key=None, timeout=5.0):
+        self.api_key = api_key or getattr(settings, "GOOGLE_MAPS_API_KEY_BACKEND", None)
+        self.timeout = timeout
+
+    def geocode(self, address):
+        """Return (lat, lng) as Decimals, or None if the address has no match."""
+        if not self.api_key:
+            raise GeocodingError("Missing GOOGLE_GEOCODING_API_KEY")
+        try:
+            response = maps_get(
+                GEOCODE_URL,
+                params={"address": address, "key": self.api_key},
+                timeout=self.timeout,
+            )
+            data = response.json()
+        except (MapsHTTPError, ValueError) as e:
+            raise GeocodingError(str(e)) from e
+
+        status = data.get("status")
+        if status == "OK":
+            coords = data["results"][0]["geometry"]["location"]
+            return Decimal(str(coords["lat"])), Decimal(str(coords["lng"]))
+        if status == "ZERO_RESULTS":
+            return None
+        raise GeocodingError(data.get("error_message") or status)
+
+
+class StubGeocoder:
+    """
+    Offline geocoder for tests and local development.
+    Known addresses come from settings.GEOCODER_STUB_RESULTS ({address: (lat, lng)});
+    anything else gets a stable pseudo-random point around Atlanta.
+    """
+
+    def __init__(self, results=None):
+        self.results = {
+            k.strip().lower(): v
+            for k, v in (results or getattr(settings, "GEOCODER_STUB_RESULTS", {})).items()
+        }
+        self.calls = []
+
+    def geocode(self, address):
+        self.calls.append(address)
+        key = address.strip().lower()
+        if key in self.results:
+            found = self.results[key]
+            if found is None:
+                return None
+            return Decimal(str(found[0])), Decimal(str(found[1]))
+        digest = hashlib.sha1(key.encode("utf-8")).digest()
+        lat = 33.749 + (digest[0] - 128) / 256.0
+        lng = -84.388 + (digest[1] - 128) / 256.0
+        return Decimal(f"{lat:.6f}"), Decimal(f"{lng:.6f}")
+
+
+def get_geocoder():
+    """Instantiate the backend named by settings.GEOCODER_BACKEND."""
+    backend = getattr(settings, "GEOCODER_BACKEND", "jobs.geocoding.GoogleGeocoder")
+    return import_string(backend)()
+
+
+def geocode_many(addresses, geocoder=None):
+    """
+    Resolve addresses through the persistent GeocodeCache. Only cache misses (or
+    expired entries) reach the geocoder, once per normalized address.
+    Returns (results, errors): {address: coords or None} and {address: message}
+    for addresses that hit a transient error and were not cached.
+    """
+    addresses = [a for a in addresses if a and normalize_address(a)]
+    results = GeocodeCache.lookup_many(addresses)
+    errors = {}
+
+    pending = {}
+    for address in addresses:
+        if address not in results:
+            pending.setdefault(normalize_address(address), []).append(address)
+    if not pending:
+        return results, errors
+
+    geocoder = geocoder or get_geocoder()
+    for same_key in pending.values():
+        try:
+            coords = geocoder.geocode(same_key[0])
+        except Exception as e:
+            for address in same_key:
+                errors[address] = str(e) or e.__class__.__name__
+            continue
+        GeocodeCache.store(same_key[0], coords)
+        for address in same_key:
+            results[address] = coords
+    return results, errors
+
+
+def take_geocode_budget(user_id, wanted):
+    """
+    Reserve up to `wanted` uncached geocodes for a user under settings.GEOCODE_USER_LIMIT
+    per GEOCODE_USER_WINDOW_SECONDS (a cache counter); returns how many were granted.
+    """
+    limit = getattr(settings, "GEOCODE_USER_LIMIT", 100)
+    window = getattr(settings, "GEOCODE_USER_WINDOW_SECONDS", 60 * 60)
+    if wanted <= 0:
+        return 0
+    key = f"geocode-budget:{user_id}"
+    cache.add(key, 0, timeout=window)
+    try:
+        used = cache.incr(key, wanted)
+    except ValueError:
+        used = wanted
+        cache.set(key, used, timeout=window)
+    return max(0, min(wanted, limit - (used - wanted)))
+
+
+def _load_target(task):
+    """The task's job or profile, freshly read, or None if it no longer exists."""
+    field = task.target_field
+    if field is None:
+        return None
+    model = GeocodeTask._meta.get_field(field).related_model
+    return model.objects.filter(pk=getattr(task, f"{field}_id")).first()
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(BASE_RETRY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_SECONDS))
+
+
+def _claim_batch(batch_size):
+    """Atomically claim up to batch_size due tasks for this worker."""
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due_ids = list(
+        GeocodeTask.objects
+        .filter(status=GeocodeTask.STATUS_PENDING, next_attempt_at__lte=now)
+        .order_by("next_attempt_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    if not due_ids:
+        return []
+    GeocodeTask.objects.filter(
+        id__in=due_ids, status=GeocodeTask.STATUS_PENDING, next_attempt_at__lte=now
+    ).update(claim_token=token, next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS))
+    return list(GeocodeTask.objects.filter(claim_token=token))
+
+
+def process_geocode_queue(batch_size=50, geocoder=None):
+    """
+    Geocode one batch of pending jobs and profiles. Identical locations in the batch are
+    resolved once. Returns a dict of counts: geocoded, not_found, retried, failed.
+    """
+    tasks = _claim_batch(batch_size)
+    counts = {"geocoded": 0, "not_found": 0, "retried": 0, "failed": 0}
+    if not tasks:
+        return counts
+
+    # Each distinct location is resolved once per batch, from the cache when possible
+    resolved, errors = geocode_many([task.location for task in tasks], geocoder=geocoder)
+
+    for task in tasks:
+        # Only touch the task while we still hold its claim: a job saved with a
+        # new location in the meantime has re-queued it under a fresh state.
+        claimed = GeocodeTask.objects.filter(pk=task.pk, claim_token=task.claim_token)
+        now = timezone.now()
+
+        if task.location in errors:
+            attempts = task.attempts + 1
+            if attempts >= MAX_ATTEMPTS:
+                claimed.update(status=GeocodeTask.STATUS_FAILED, attempts=attempts,
+                               last_error=errors[task.location], claim_token="", updated_at=now)
+                counts["failed"] += 1
+            else:
+                claimed.update(attempts=attempts, last_error=errors[task.location], claim_token="",
+                               next_attempt_at=now + _retry_delay(attempts), updated_at=now)
+                counts["retried"] += 1
+            continue
+
+        coords = resolved.get(task.location)
+        if coords is None:
+            claimed.update(status=GeocodeTask.STATUS_FAILED, attempts=task.attempts + 1,
+                           last_error="No results", claim_token="", updated_at=now)
+            counts["not_found"] += 1
+            continue
+
+        with transaction.atomic():
+            # A target whose address changed since it was queued has been re-queued for the new one
+            target = _load_target(task)
+            if target is not None and (target.geocode_query or "")[:255] == task.location:
+                target.latitude, target.longitude = coords
+                target.save(update_fields=["latitude", "longitude"])
+            claimed.delete()
+        counts["geocoded"] += 1
+
+    return counts
@@ -0,0 +1,145 @@
+# Shared pooled HTTP client for outbound Google Maps traffic (Distance Matrix, Geocoding)
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+USER_AGENT = "GTJobSearch/1.0"
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "errors": 0,
+    "total_latency_ms": 0.0,
+    "max_latency_ms": 0.0,
+    "connections_opened": 0,
+}
+
+
+class MapsHTTPError(Exception):
+    """Network or HTTP failure talking to Google Maps (API key redacted from the message)."""
+
+
+def _redact(message):
+    return re.sub(r"key=[^&\s'\"]+", "key=REDACTED", message)
+
+
+_adapters = {}
+_adapter_lock = threading.Lock()
+_local = threading.local()
+
+
+def _count_new_connection():
+    with _stats_lock:
+        _stats["connections_opened"] += 1
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count_new_connection()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools count every new (non-reused) connection."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _get_adapter(retries=True):
+    # One adapter (and so one set of keep-alive pools) per retry policy for the whole process
+    adapter = _adapters.get(retries)
+    if adapter is None:
+        with _adapter_lock:
+            adapter = _adapters.get(retries)
+            if adapter is None:
+                pool_size = getattr(settings, "GOOGLE_MAPS_HTTP_POOL_SIZE", 10)
+                if retries:
+                    retry = Retry(
+                        total=getattr(settings, "GOOGLE_MAPS_HTTP_RETRIES", 2),
+                        backoff_factor=getattr(settings, "GOOGLE_MAPS_HTTP_BACKOFF", 0.3),
+                        status_forcelist=(500, 502, 503, 504),
+                        allowed_methods=frozenset({"GET"}),
+                        raise_on_status=False,
+                    )
+                else:
+                    retry = Retry(total=0, read=False, raise_on_status=False)
+                adapter = _adapters[retries] = PooledHTTPAdapter(
+                    pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry,
+                )
+    return adapter
+
+
+def get_maps_session(retries=True):
+    """
+    Session for Google Maps calls. Each thread gets its own Session object, but they
+    all share the same adapter, so keep-alive connections are pooled process-wide.
+    With retries=False failed calls are never retried (for callers under a deadline).
+    """
+    sessions = _local.__dict__.setdefault("sessions", {})
+    session = sessions.get(retries)
+    if session is None:
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        adapter = _get_adapter(retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        sessions[retries] = session
+    return session
+
+
+def maps_get(url, params=None, timeout=None, retries=True):
+    """
+    GET through the pooled session, recording latency. Returns the requests.Response;
+    connection errors and HTTP error statuses raise MapsHTTPError. Pass retries=False
+    when the call must finish within `timeout`: otherwise timeouts and 5xx responses are
+    retried (settings.GOOGLE_MAPS_HTTP_RETRIES), each attempt getting the full timeout.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "GOOGLE_MAPS_HTTP_TIMEOUT", 7.0)
+    start = time.perf_counter()
+    try:
+        response = get_maps_session(retries).get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response
+    except requests.RequestException as e:
+        with _stats_lock:
+            _stats["errors"] += 1
+        raise MapsHTTPError(_redact(f"{e.__class__.__name__}: {e}")) from None
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with _stats_lock:
+            _stats["requests"] += 1
+            _stats["total_latency_ms"] += elapsed_ms
+            _stats["max_latency_ms"] = max(_stats["max_latency_ms"], elapsed_ms)
+
+
+def maps_http_stats():
+    """Snapshot of the process-wide counters: calls, latency and connection reuse."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["avg_latency_ms"] = stats["total_latency_ms"] / stats["requests"] if stats["requests"] else 0.0
+    stats["connections_reused"] = max(stats["requests"] - stats["connections_opened"], 0)
+    return stats
+
+
+def reset_maps_http_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0 if isinstance(_stats[key], int) else 0.0
@@ -0,0 +1,151 @@
+# Bulk job import from CSV/JSONL feeds: rows validated with JobForm, unique locations
+# geocoded once, jobs and their skill links inserted with bulk_create in chunks
+import csv
+import json
+import os
+import re
+
+from django.db import transaction
+
+from .forms import JobForm
+from .geocoding import geocode_many
+from .matching import refresh_matches
+from .models import GeocodeTask, Job, Skill
+from .result_cache import bump_jobs_version
+from .utils import is_remote_location
+
+IMPORT_CHUNK_SIZE = 500
+
+# Skill lists in a CSV cell are separated by commas, semicolons or pipes
+_SKILL_SEPARATOR_RE = re.compile(r"[,;|]")
+
+
+def feed_format(path, fmt=None):
+    """"csv" or "jsonl" for a feed, from `fmt` or the file extension."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt in ("jsonl", "ndjson"):
+        return "jsonl"
+    if fmt == "csv":
+        return "csv"
+    raise ValueError(f"unknown feed format {fmt!r} (use csv or jsonl)")
+
+
+def read_feed(path, fmt=None):
+    """
+    Stream (line number, row dict) from a CSV (header row) or JSON-lines feed without
+    loading the whole file. A JSONL line that is not a JSON object yields a string
+    instead of a dict, for the caller to report.
+    """
+    if feed_format(path, fmt) == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"invalid JSON: {e}"
+                continue
+            yield line_no, row if isinstance(row, dict) else "not a JSON object"
+
+
+def skill_names(value):
+    """Skill names from a feed value: a list, or a comma/semicolon/pipe separated string."""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        names = [str(v) for v in value]
+    else:
+        names = _SKILL_SEPARATOR_RE.split(str(value))
+    seen = {}
+    for name in names:
+        name = name.strip()
+        if name:
+            seen.setdefault(name.lower(), name)
+    return list(seen.values())
+
+
+def validate_row(row):
+    """(Job, required skill names, preferred skill names) for a valid row, else raise ValueError with the form errors."""
+    if not isinstance(row, dict):
+        raise ValueError(row)
+    data = {k: v for k, v in row.items() if k is not None}
+    required, preferred = skill_names(data.pop("required_skills", None)), skill_names(data.pop("preferred_skills", None))
+    form = JobForm(data=data)
+    if not form.is_valid():
+        raise ValueError("; ".join(
+            f"{field}: {' '.join(errors)}" for field, errors in form.errors.items()
+        ))
+    return form.save(commit=False), required, preferred
+
+
+def _skills_by_name(names):
+    """{lowercase name: Skill} for `names`, creating skills that do not exist yet."""
+    wanted = {name.lower(): name for name in names}
+    if not wanted:
+        return {}
+    existing = {s.name.lower(): s for s in Skill.objects.filter(name__in=list(wanted.values()))}
+    # Case-insensitive match against names stored with other capitalization
+    missing = set(wanted) - set(existing)
+    if missing:
+        for skill in Skill.objects.all().only("id", "name"):
+            if skill.name.lower() in missing:
+                existing.setdefault(skill.name.lower(), skill)
+        new = [Skill(name=wanted[key]) for key in set(wanted) - set(existing)]
+        if new:
+            Skill.objects.bulk_create(new, ignore_conflicts=True)
+            for skill in Skill.objects.filter(name__in=[s.name for s in new]):
+                existing[skill.name.lower()] = skill
+    return existing
+
+
+def insert_jobs(rows, recruiter=None, geocoder=None):
+    """
+    Insert one chunk of validated rows ((Job, required names, preferred names), as from
+    validate_row) in a single transaction. Locations are geocoded once per distinct value
+    through the shared geocode cache; jobs whose geocode failed transiently are queued
+    for the background worker. bulk_create() skips Job.save(), so the derived columns
+    are filled and candidate matches scored here (the search index is kept in sync by its
+    database triggers).
+    Returns {"created", "geocoded", "queued"}.
+    """
+    jobs = [job for job, _, _ in rows]
+    locations = {job.location for job in jobs if job.location and not is_remote_location(job.location)}
+    coords, errors = geocode_many(locations, geocoder=geocoder) if locations else ({}, {})
+
+    geocoded = 0
+    for job in jobs:
+        job.recruiter = recruiter
+        found = coords.get(job.location)
+        if found is not None:
+            job.latitude, job.longitude = found
+            geocoded += 1
+        job.refresh_derived_fields()
+
+    skills = _skills_by_name({name for _, required, preferred in rows for name in required + preferred})
+    Required = Job.required_skills.through
+    Preferred = Job.preferred_skills.through
+
+    with transaction.atomic():
+        Job.objects.bulk_create(jobs)
+        Required.objects.bulk_create([
+            Required(job_id=job.pk, skill_id=skills[name.lower()].pk)
+            for job, required, _ in rows for name in required
+        ])
+        Preferred.objects.bulk_create([
+            Preferred(job_id=job.pk, skill_id=skills[name.lower()].pk)
+            for job, _, preferred in rows for name in preferred
+        ])
+        queued = [GeocodeTask(job=job, location=job.location) for job in jobs if job.location in errors]
+        GeocodeTask.objects.bulk_create(queued)
+        # bulk_create() of the skill links sends no m2m_changed, so score the new jobs here
+        refresh_matches(job_ids=[job.pk for job in jobs])
+
+    bump_jobs_version()  # bulk_create() skips the signals that invalidate cached results
+    return {"created": len(jobs), "geocoded": geocoded, "queued": len(queued)}
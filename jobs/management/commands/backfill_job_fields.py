@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from jobs.result_cache import bump_jobs_version
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized Job columns (Job.DERIVED_FIELDS) for every job, e.g. after bulk imports or rule changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fields = list(Job.DERIVED_FIELDS)
+        batch_size = options["batch_size"]
+        checked = changed = 0
+        batch = []
+        for job in Job.objects.order_by("pk").iterator(chunk_size=batch_size):
+            before = [getattr(job, f) for f in fields]
+            job.refresh_derived_fields()
+            checked += 1
+            if [getattr(job, f) for f in fields] != before:
+                batch.append(job)
+            if len(batch) >= batch_size:
+                Job.objects.bulk_update(batch, fields)
+                changed += len(batch)
+                batch = []
+        if batch:
+            Job.objects.bulk_update(batch, fields)
+            changed += len(batch)
+        if changed:
+            bump_jobs_version()  # bulk_update() skips the signals that invalidate cached results
+        self.stdout.write(f"Checked {checked} jobs, updated {changed} ({', '.join(fields)})")
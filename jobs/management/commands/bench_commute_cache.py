@@ -0,0 +1,59 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from jobs.utils import commute_cache_key, haversine
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay simulated commute searches against the commute cache key scheme and report, "
+        "per origin precision, the hit rate and how far reused results are from the real origin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--searches", type=int, default=2000)
+        parser.add_argument("--jobs", type=int, default=300)
+        parser.add_argument("--neighbourhoods", type=int, default=12)
+        parser.add_argument("--spread-miles", type=float, default=0.5,
+                            help="Typical distance of a seeker from their neighbourhood centre.")
+        parser.add_argument("--precisions", nargs="+", type=int, default=[5, 6, 7, 8])
+        parser.add_argument("--destination-precision", type=int, default=7)
+        parser.add_argument("--seed", type=int, default=2340)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        degrees = options["spread_miles"] / 69.0
+        centres = [(33.75 + rng.uniform(-0.3, 0.3), -84.39 + rng.uniform(-0.3, 0.3))
+                   for _ in range(options["neighbourhoods"])]
+        jobs = [(33.75 + rng.uniform(-0.5, 0.5), -84.39 + rng.uniform(-0.5, 0.5))
+                for _ in range(options["jobs"])]
+        searches = []
+        for _ in range(options["searches"]):
+            clat, clng = rng.choice(centres)
+            searches.append((clat + rng.gauss(0, degrees), clng + rng.gauss(0, degrees)))
+
+        self.stdout.write(
+            f"{options['searches']} searches x {options['jobs']} jobs, "
+            f"destination precision {options['destination_precision']}"
+        )
+        self.stdout.write(f"{'origin precision':>16} {'hit rate':>9} {'API elements':>13} {'mean offset (mi)':>17}")
+        for origin_precision in options["precisions"]:
+            precision = {"origin": origin_precision, "destination": options["destination_precision"]}
+            filled_by = {}
+            hits = misses = 0
+            offset_total = 0.0
+            for (olat, olng) in searches:
+                for (dlat, dlng) in jobs:
+                    key = commute_cache_key(olat, olng, dlat, dlng, precision=precision)
+                    source = filled_by.get(key)
+                    if source is None:
+                        filled_by[key] = (olat, olng)
+                        misses += 1
+                    else:
+                        hits += 1
+                        offset_total += haversine(olng, olat, source[1], source[0])
+            self.stdout.write(
+                f"{origin_precision:>16} {hits / (hits + misses):>9.1%} {misses:>13}"
+                f" {offset_total / hits if hits else 0.0:>17.3f}"
+            )
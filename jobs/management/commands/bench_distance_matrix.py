@@ -0,0 +1,154 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from jobs.http_client import maps_http_stats, reset_maps_http_stats
+from jobs.utils import (
+    CalibratedCommuteBackend, HaversineCommuteBackend, batch_road_distance_and_time,
+    commute_cache_stats, haversine, reset_commute_cache_stats,
+)
+
+
+def fake_element(olat, olng, dlat, dlng):
+    """
+    The fake server's Distance Matrix element: the straight line times a road circuity
+    of 1.1-1.5 that varies with the destination, at 35 mph (28 mph in traffic).
+    """
+    miles = haversine(olng, olat, dlng, dlat) * (1.3 + 0.2 * math.sin(dlat * 977.0 + dlng * 613.0))
+    return {
+        "status": "OK",
+        "distance": {"value": int(miles * 1609.344)},
+        "duration": {"value": int(miles / 35.0 * 3600)},
+        "duration_in_traffic": {"value": int(miles / 28.0 * 3600)},
+    }
+
+
+def make_handler(latency):
+    class FakeDistanceMatrixHandler(BaseHTTPRequestHandler):
+        """Answers Distance Matrix requests with haversine-based results after a fixed delay."""
+
+        def do_GET(self):
+            time.sleep(latency)
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            olat, olng = map(float, query["origins"][0].split(","))
+            elements = []
+            for dest in query["destinations"][0].split("|"):
+                dlat, dlng = map(float, dest.split(","))
+                elements.append(fake_element(olat, olng, dlat, dlng))
+            body = json.dumps({"status": "OK", "rows": [{"elements": elements}]}).encode("utf-8")
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client gave up at its deadline
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeDistanceMatrixHandler
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark batch_road_distance_and_time against a local fake Distance Matrix server. "
+        "The commute calibration it records is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--destinations", type=int, default=200)
+        parser.add_argument("--held-out", type=int, default=100, help="Destinations the estimators are scored on.")
+        parser.add_argument("--latency-ms", type=float, default=300.0, help="Injected server latency per request.")
+        parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8])
+        parser.add_argument("--deadline", type=float, default=60.0)
+        parser.add_argument("--seed", type=int, default=2340)
+
+    def handle(self, *args, **options):
+        # The fake answers feed CommuteCalibration, which real searches read, so never keep them
+        with transaction.atomic():
+            self.benchmark(options)
+            transaction.set_rollback(True)
+
+    def benchmark(self, options):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(options["latency_ms"] / 1000.0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/maps/api/distancematrix/json"
+        os.environ.setdefault("GOOGLE_MAPS_API_KEY", "bench-key")
+
+        rng = random.Random(options["seed"])
+
+        def random_destinations(count):
+            return [
+                (round(33.77 + rng.uniform(-0.5, 0.5), 6), round(-84.39 + rng.uniform(-0.5, 0.5), 6), i)
+                for i in range(count)
+            ]
+
+        destinations = random_destinations(options["destinations"])
+        held_out = random_destinations(options["held_out"])
+
+        self.stdout.write(
+            f"{options['destinations']} destinations, {options['latency_ms']:.0f} ms injected latency per request"
+        )
+        self.stdout.write(
+            f"{'concurrency':>12} {'wall (s)':>10} {'ok':>6} {'fallback':>9} {'new conns':>10} {'reused':>7} {'cache trips':>12}"
+        )
+        try:
+            with override_settings(GOOGLE_MAPS_DISTANCE_MATRIX_URL=url):
+                for run, concurrency in enumerate(options["concurrency"]):
+                    # A fresh origin cell per run so earlier runs cannot serve from the cache
+                    origin = (33.7756 + 0.05 * run + rng.uniform(0, 0.01), -84.3963 + rng.uniform(-0.01, 0.01))
+                    reset_maps_http_stats()
+                    reset_commute_cache_stats()
+                    start = time.perf_counter()
+                    results = batch_road_distance_and_time(
+                        origin[0], origin[1], destinations,
+                        max_concurrency=concurrency, deadline=options["deadline"],
+                    )
+                    elapsed = time.perf_counter() - start
+                    ok = sum(1 for r in results.values() if r["status"] == "OK")
+                    stats = maps_http_stats()
+                    cache_stats = commute_cache_stats()
+                    self.stdout.write(
+                        f"{concurrency:>12} {elapsed:>10.2f} {ok:>6} {len(results) - ok:>9}"
+                        f" {stats['connections_opened']:>10} {stats['connections_reused']:>7}"
+                        f" {cache_stats['round_trips']:>12}"
+                    )
+        finally:
+            server.shutdown()
+
+        # Offline estimators scored on destinations the runs never sent, so the calibrated
+        # one (which has just learned from the runs) is not graded on its training data
+        if not held_out:
+            return
+        actual = {}
+        for dlat, dlng, ident in held_out:
+            element = fake_element(origin[0], origin[1], dlat, dlng)
+            actual[ident] = {
+                "distance_miles": element["distance"]["value"] / 1609.344,
+                "duration_in_traffic_minutes": element["duration_in_traffic"]["value"] / 60.0,
+            }
+        self.stdout.write(f"{'estimator':>12} {'wall (ms)':>10} {'miles err':>10} {'minutes err':>12}")
+        for label, backend in (("haversine", HaversineCommuteBackend()), ("calibrated", CalibratedCommuteBackend())):
+            start = time.perf_counter()
+            estimates = backend.estimate_many(origin[0], origin[1], held_out)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            miles_err = sum(abs(estimates[i]["distance_miles"] - r["distance_miles"]) for i, r in actual.items())
+            minutes_err = sum(
+                abs((estimates[i]["duration_in_traffic_minutes"] or estimates[i]["duration_minutes"])
+                    - r["duration_in_traffic_minutes"])
+                for i, r in actual.items()
+            )
+            self.stdout.write(
+                f"{label:>12} {elapsed_ms:>10.1f} {miles_err / len(actual):>10.2f} {minutes_err / len(actual):>12.2f}"
+            )
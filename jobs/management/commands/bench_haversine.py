@@ -0,0 +1,49 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.utils import batch_haversine, haversine, np
+
+
+class Command(BaseCommand):
+    help = "Benchmark the per-job haversine loop against the vectorized batch_haversine."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+        parser.add_argument("--radius", type=float, default=25.0)
+        parser.add_argument("--seed", type=int, default=2340)
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError("NumPy is not installed; batch_haversine would use the same plain loop.")
+
+        rng = random.Random(options["seed"])
+        origin_lat, origin_lng = 33.7756, -84.3963  # Georgia Tech campus
+        radius = options["radius"]
+
+        self.stdout.write(f"{'jobs':>10} {'loop (ms)':>12} {'batch (ms)':>12} {'speedup':>9}")
+        for size in options["sizes"]:
+            lats = [origin_lat + rng.uniform(-2.0, 2.0) for _ in range(size)]
+            lngs = [origin_lng + rng.uniform(-2.0, 2.0) for _ in range(size)]
+            lat_arr = np.asarray(lats)
+            lng_arr = np.asarray(lngs)
+
+            start = time.perf_counter()
+            loop_hits = sum(
+                1 for lat, lng in zip(lats, lngs)
+                if haversine(origin_lng, origin_lat, lng, lat) <= radius
+            )
+            loop_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            _, mask = batch_haversine(origin_lat, origin_lng, lat_arr, lng_arr, radius=radius)
+            batch_hits = int(mask.sum())
+            batch_ms = (time.perf_counter() - start) * 1000
+
+            if loop_hits != batch_hits:
+                raise CommandError(f"Result mismatch at {size} jobs: loop={loop_hits} batch={batch_hits}")
+
+            self.stdout.write(
+                f"{size:>10} {loop_ms:>12.1f} {batch_ms:>12.1f} {loop_ms / max(batch_ms, 1e-9):>8.1f}x"
+            )
@@ -0,0 +1,112 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import JobSeekerProfile
+from jobs.matching import refresh_matches
+from jobs.models import PREFERRED_SKILL_WEIGHT, REQUIRED_SKILL_WEIGHT, Job, Skill
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark recommended candidate pages (weighted skill match, read from JobCandidateMatch) "
+        "against computing the scores live and the old unranked skills__in query, on generated job "
+        "seekers. Everything is created in a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seekers", type=int, default=100_000)
+        parser.add_argument("--skills", type=int, default=300, help="Size of the generated skill pool.")
+        parser.add_argument("--skills-per-seeker", type=int, default=8)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=2340)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with transaction.atomic():
+            job, expected = self.generate(rng, options)
+            self.run(job, expected, options)
+            transaction.set_rollback(True)
+
+    def generate(self, rng, options):
+        """Create the skill pool, seekers and one job; returns (job, expected ranking as (score, required, pk))."""
+        start = time.perf_counter()
+        Skill.objects.bulk_create([Skill(name=f"bench-skill-{i}") for i in range(options["skills"])])
+        skill_ids = list(Skill.objects.filter(name__startswith="bench-skill-").values_list("id", flat=True))
+        # Popular skills are much more common than rare ones (Zipf-like)
+        popularity = [1.0 / (rank + 1) for rank in range(len(skill_ids))]
+
+        required = set(rng.sample(skill_ids[:50], 4))
+        preferred = set(rng.sample([s for s in skill_ids[:100] if s not in required], 4))
+        job = Job(title="Benchmark job", company="Bench", description="", location="Remote")
+        job.refresh_derived_fields()
+        Job.objects.bulk_create([job])
+        job.required_skills.set(required)
+        job.preferred_skills.set(preferred)
+
+        Through = JobSeekerProfile.skills.through
+        expected = []
+        batch = 5000
+        for offset in range(0, options["seekers"], batch):
+            count = min(batch, options["seekers"] - offset)
+            users = User.objects.bulk_create([User(username=f"bench-seeker-{offset + i}") for i in range(count)])
+            profiles = JobSeekerProfile.objects.bulk_create([JobSeekerProfile(user=user) for user in users])
+            links = []
+            for profile in profiles:
+                skills = set(rng.choices(skill_ids, weights=popularity, k=options["skills_per_seeker"]))
+                links.extend(Through(jobseekerprofile_id=profile.pk, skill_id=s) for s in skills)
+                r, p = len(skills & required), len(skills & preferred)
+                if r or p:
+                    expected.append((r * REQUIRED_SKILL_WEIGHT + p * PREFERRED_SKILL_WEIGHT, r, profile.pk))
+            Through.objects.bulk_create(links)
+        expected.sort(key=lambda e: (-e[0], -e[1], e[2]))
+        self.stdout.write(
+            f"Generated {options['seekers']} seekers ({len(expected)} matching) in {time.perf_counter() - start:.1f}s"
+        )
+        # The seeker skill links were bulk-created (no m2m signals), so materialize the matches
+        start = time.perf_counter()
+        refresh_matches(job_ids=[job.pk])
+        self.stdout.write(f"Materialized the job's matches in {time.perf_counter() - start:.1f}s")
+        return job, expected
+
+    def run(self, job, expected, options):
+        page_size = options["page_size"]
+        skills = list(job.required_skills.all()) + list(job.preferred_skills.all())
+
+        def legacy():
+            return list(JobSeekerProfile.objects.filter(skills__in=skills).distinct()[:page_size])
+
+        def first_page():
+            return job.recommended_candidates_page(page_size=page_size)[0]
+
+        deep_after = expected[min(len(expected), page_size * 10) - 1] if expected else None
+
+        def deep_page():
+            return job.recommended_candidates_page(deep_after, page_size)[0]
+
+        def live_page():
+            return list(job.candidate_match_scores()[:page_size])
+
+        page = first_page()
+        got = [(c.match_score, c.required_matches, c.pk) for c in page]
+        live = [(row["match_score"], row["required_matches"], row["candidate_id"]) for row in live_page()]
+        if got != expected[:page_size] or live != expected[:page_size]:
+            raise CommandError(f"Ranking mismatch: got {got[:3]}/{live[:3]}..., expected {expected[:3]}...")
+
+        self.stdout.write(f"{'query':>28} {'best (ms)':>10} {'mean (ms)':>10}")
+        for name, fn in [
+            ("unranked skills__in (old)", legacy),
+            ("live scores, page 1", live_page),
+            ("materialized, page 1", first_page),
+            ("materialized, page 11", deep_page),
+        ]:
+            times = []
+            for _ in range(options["runs"]):
+                start = time.perf_counter()
+                fn()
+                times.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(f"{name:>28} {min(times):>10.1f} {sum(times) / len(times):>10.1f}")
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from accounts.models import JobSeekerProfile, RecruiterProfile
+from jobs.geocoding import geocode_many, get_geocoder
+from jobs.models import GeocodeCache, GeocodeTask
+
+
+class Command(BaseCommand):
+    help = (
+        "Geocode job seeker and recruiter profiles that have an address but no coordinates, so "
+        "they show up on the maps. Each distinct address is resolved once through the shared "
+        "geocode cache; addresses that fail transiently are queued for process_geocode_queue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--queue", action="store_true", help="Make no geocoding calls: use cached results and queue the rest for the worker.")
+        parser.add_argument("--backend", help="Dotted path of a geocoder class, overriding settings.GEOCODER_BACKEND.")
+
+    def handle(self, *args, **options):
+        geocoder = None
+        if not options["queue"]:
+            geocoder = import_string(options["backend"])() if options["backend"] else get_geocoder()
+        totals = {"geocoded": 0, "not_found": 0, "queued": 0}
+        batch_size = options["batch_size"]
+
+        for model in (JobSeekerProfile, RecruiterProfile):
+            # Collect the ids first: the rows are written back while we go
+            pks = list(
+                model.objects.filter(Q(latitude__isnull=True) | Q(longitude__isnull=True))
+                .order_by("pk").values_list("pk", flat=True)
+            )
+            for start in range(0, len(pks), batch_size):
+                profiles = [p for p in model.objects.filter(pk__in=pks[start:start + batch_size]) if p.geocode_query]
+                self.geocode(profiles, geocoder, totals)
+            self.stdout.write(f"{model.__name__}: {len(pks)} without coordinates")
+
+        self.stdout.write(
+            f"Geocoded {totals['geocoded']} profiles, {totals['not_found']} addresses not found, "
+            f"{totals['queued']} queued for geocoding"
+        )
+
+    def geocode(self, profiles, geocoder, totals):
+        if geocoder is None:
+            # Cached addresses are still filled in; only unknown ones go to the worker
+            coords = GeocodeCache.lookup_many([p.geocode_query for p in profiles])
+            errors = {p.geocode_query: "not cached" for p in profiles if p.geocode_query not in coords}
+        else:
+            coords, errors = geocode_many([p.geocode_query for p in profiles], geocoder=geocoder)
+
+        for profile in profiles:
+            address = profile.geocode_query
+            if address in errors:
+                GeocodeTask.enqueue(profile)
+                totals["queued"] += 1
+            elif coords.get(address) is not None:
+                profile.latitude, profile.longitude = coords[address]
+                profile.save(update_fields=["latitude", "longitude"])
+                totals["geocoded"] += 1
+            else:
+                totals["not_found"] += 1
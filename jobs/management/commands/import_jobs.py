@@ -0,0 +1,113 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from accounts.models import RecruiterProfile
+from jobs.geocoding import get_geocoder
+from jobs.importer import IMPORT_CHUNK_SIZE, insert_jobs, read_feed, validate_row
+
+
+class Command(BaseCommand):
+    help = (
+        "Import jobs from a CSV (header row) or JSON-lines feed. Rows are validated with the job form "
+        "rules and inserted in chunks; skills are listed by name (comma separated in CSV). Progress is "
+        "checkpointed after every chunk, so an interrupted import resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Feed file (.csv, .jsonl or .ndjson).")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Feed format, if the extension does not tell.")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument("--recruiter", help="Username of the recruiter the jobs are posted under.")
+        parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint).")
+        parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start from the top.")
+        parser.add_argument("--dry-run", action="store_true", help="Only validate the rows.")
+        parser.add_argument("--backend", help="Dotted path of a geocoder class, overriding settings.GEOCODER_BACKEND.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+
+        recruiter = None
+        if options["recruiter"]:
+            recruiter = RecruiterProfile.objects.filter(user__username=options["recruiter"]).first()
+            if recruiter is None:
+                raise CommandError(f"No recruiter profile for user {options['recruiter']!r}")
+        geocoder = import_string(options["backend"])() if options["backend"] else get_geocoder()
+
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        checkpoint = {} if options["restart"] else self.read_checkpoint(checkpoint_path, path)
+        resume_after = checkpoint.get("line", 0)
+        totals = {key: checkpoint.get(key, 0) for key in ("created", "invalid", "geocoded", "queued")}
+        if resume_after:
+            self.stdout.write(f"Resuming after line {resume_after} ({totals['created']} jobs already imported)")
+
+        started = time.monotonic()
+        chunk, last_line = [], resume_after
+        try:
+            rows = read_feed(path, options["format"])
+            for line_no, row in rows:
+                if line_no <= resume_after:
+                    continue
+                last_line = line_no
+                try:
+                    chunk.append(validate_row(row))
+                except ValueError as e:
+                    totals["invalid"] += 1
+                    self.stderr.write(f"line {line_no}: {e}")
+                if len(chunk) >= options["chunk_size"]:
+                    self.flush(chunk, recruiter, geocoder, totals, options["dry_run"])
+                    chunk = []
+                    self.save_checkpoint(checkpoint_path, path, last_line, totals, options["dry_run"])
+                    self.progress(last_line, totals, started)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if chunk:
+            self.flush(chunk, recruiter, geocoder, totals, options["dry_run"])
+            self.progress(last_line, totals, started)
+        self.save_checkpoint(checkpoint_path, path, last_line, totals, options["dry_run"])
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            f"{verb} {totals['created']} jobs, skipped {totals['invalid']} invalid rows; "
+            f"{totals['geocoded']} geocoded, {totals['queued']} queued for geocoding"
+        )
+
+    def flush(self, chunk, recruiter, geocoder, totals, dry_run):
+        if dry_run:
+            totals["created"] += len(chunk)
+            return
+        counts = insert_jobs(chunk, recruiter=recruiter, geocoder=geocoder)
+        for key, count in counts.items():
+            totals[key] += count
+
+    def progress(self, line, totals, started):
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"line {line}: {totals['created']} created, {totals['invalid']} invalid ({elapsed:.1f}s)"
+        )
+
+    def read_checkpoint(self, checkpoint_path, path):
+        try:
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            raise CommandError(f"Unreadable checkpoint {checkpoint_path}; use --restart to start over")
+        if checkpoint.get("path") != os.path.abspath(path):
+            raise CommandError(f"Checkpoint {checkpoint_path} belongs to {checkpoint.get('path')}; use --restart")
+        return checkpoint
+
+    def save_checkpoint(self, checkpoint_path, path, line, totals, dry_run):
+        """Record the last imported line, after its chunk committed (written atomically)."""
+        if dry_run:
+            return
+        tmp = f"{checkpoint_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"path": os.path.abspath(path), "line": line, **totals}, f)
+        os.replace(tmp, checkpoint_path)
@@ -0,0 +1,37 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.commutes import PRECOMPUTE_BATCH_SIZE, popular_origins, precompute_commutes
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute road distance/time from each popular origin (settings.COMMUTE_POPULAR_ORIGINS) "
+        "to every geocoded job. Only new, moved or stale pairs are fetched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--origin", action="append", dest="origins",
+                            help="Only this origin (by name); may be repeated.")
+        parser.add_argument("--max-age-hours", type=float, default=24.0,
+                            help="Recompute rows older than this (0 keeps rows until the job moves).")
+        parser.add_argument("--batch-size", type=int, default=PRECOMPUTE_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep running, picking up new and moved jobs.")
+        parser.add_argument("--interval", type=float, default=300.0, help="Seconds to sleep between runs in --loop mode.")
+
+    def handle(self, *args, **options):
+        if not popular_origins():
+            self.stdout.write("No COMMUTE_POPULAR_ORIGINS configured.")
+            return
+        max_age = timedelta(hours=options["max_age_hours"]) if options["max_age_hours"] else None
+
+        while True:
+            written = precompute_commutes(options["origins"], max_age=max_age, batch_size=options["batch_size"])
+            for name, count in written.items():
+                if count:
+                    self.stdout.write(f"{name}: {count} commutes updated")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
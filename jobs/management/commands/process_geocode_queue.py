@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from jobs.geocoding import get_geocoder, process_geocode_queue
+
+
+class Command(BaseCommand):
+    help = "Geocode jobs and profiles waiting in the background geocoding queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the queue instead of exiting when it is empty.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep between polls in --loop mode.")
+        parser.add_argument("--backend", help="Dotted path of a geocoder class, overriding settings.GEOCODER_BACKEND.")
+
+    def handle(self, *args, **options):
+        geocoder = import_string(options["backend"])() if options["backend"] else get_geocoder()
+
+        while True:
+            counts = process_geocode_queue(batch_size=options["batch_size"], geocoder=geocoder)
+            if any(counts.values()):
+                self.stdout.write(
+                    "geocoded={geocoded} not_found={not_found} retried={retried} failed={failed}".format(**counts)
+                )
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.matching import refresh_matches
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the job/candidate skill match table (JobCandidateMatch), e.g. after skill links "
+        "were changed in bulk or the match weights changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job", type=int, action="append", dest="job_ids", help="Only this job (by id); may be repeated.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = refresh_matches(job_ids=options["job_ids"])
+        self.stdout.write(f"Wrote {written} candidate matches in {time.perf_counter() - start:.1f}s")
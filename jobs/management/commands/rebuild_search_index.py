@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from jobs.models import Job
+from jobs.search import install_search_index, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text job search index (SQLite FTS5) from the jobs table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--optimize", action="store_true", help="Also merge the index into a single b-tree.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The FTS5 search index is only used on SQLite.")
+
+        start = time.perf_counter()
+        if not install_search_index(connection):
+            rebuild_search_index(connection, optimize=options["optimize"])
+        elif options["optimize"]:
+            rebuild_search_index(connection, optimize=True)
+        self.stdout.write(f"Indexed {Job.objects.count()} jobs in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,158 @@
+# Map markers for a viewport: grid clusters when zoomed out, individual markers when zoomed in
+from django.conf import settings
+from django.db.models import Avg, Count, FloatField, Max, Min, Q
+from django.db.models.functions import Cast, Floor
+from django.http import JsonResponse
+
+from .models import haversine_sql
+from .utils import bounding_box
+
+# Grid cells per 256px map tile when clustering (about 64px per cell on screen)
+CLUSTER_CELLS_PER_TILE = 4
+# Upper bound on grid cells along either side of the viewport, whatever zoom the client sends
+MAX_GRID_CELLS = 32
+
+
+def parse_viewport(params):
+    """(south, west, north, east, zoom) from south/west/north/east/zoom params; ValueError if invalid."""
+    try:
+        south, west, north, east = (float(params[k]) for k in ("south", "west", "north", "east"))
+        zoom = int(params["zoom"])
+    except (KeyError, TypeError):
+        raise ValueError("south, west, north, east and zoom are required")
+    if not (-90 <= south <= north <= 90) or not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("invalid bounds")
+    if not 0 <= zoom <= 22:
+        raise ValueError("invalid zoom")
+    return south, west, north, east, zoom
+
+
+def cluster_cell_degrees(zoom):
+    """Cluster grid cell size in degrees for a Web Mercator zoom level."""
+    return 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+
+
+def _in_viewport(south, west, north, east):
+    """Q for rows inside the box; a box crossing the antimeridian has west > east."""
+    q = Q(latitude__range=(south, north))
+    if west <= east:
+        return q & Q(longitude__range=(west, east))
+    return q & (Q(longitude__gte=west) | Q(longitude__lte=east))
+
+
+def within_radius(queryset, lat, lng, radius):
+    """Rows of any queryset with latitude/longitude within `radius` straight-line miles of lat/lng."""
+    (lat_min, lat_max), (lng_min, lng_max) = bounding_box(lat, lng, radius)
+    return (
+        queryset.filter(latitude__range=(lat_min, lat_max), longitude__range=(lng_min, lng_max))
+        .annotate(distance_miles=haversine_sql(lat, lng))
+        .filter(distance_miles__lte=float(radius))
+    )
+
+
+def viewport_markers(sources, viewport):
+    """
+    Markers for the rows of `sources` inside `viewport` ((south, west, north, east, zoom)).
+
+    `sources` is a list of (queryset, to_marker) pairs; rows need latitude/longitude columns
+    and to_marker(row) returns the marker dict for one row. Up to settings.MAP_CLUSTER_MAX_ZOOM,
+    or whenever more than settings.MAP_MAX_MARKERS rows are in view, rows are counted per grid
+    cell in SQL and each cell is returned as one cluster (cells holding a single row come back
+    as that row's marker). Otherwise every row in view is returned as a marker.
+    Returns {"total", "clustered", "clusters", "markers"}.
+    """
+    south, west, north, east, zoom = viewport
+    in_view = _in_viewport(south, west, north, east)
+    # Re-base on the primary key so joins/distinct() in the source query don't skew the counts
+    scoped = [
+        (queryset.model._default_manager.filter(pk__in=queryset.values("pk")).filter(in_view).order_by(),
+         queryset, to_marker)
+        for queryset, to_marker in sources
+    ]
+    total = sum(rows.count() for rows, _, _ in scoped)
+
+    max_markers = getattr(settings, "MAP_MAX_MARKERS", 500)
+    if zoom > getattr(settings, "MAP_CLUSTER_MAX_ZOOM", 13) and total <= max_markers:
+        markers = []
+        for rows, queryset, to_marker in scoped:
+            markers.extend(to_marker(row) for row in queryset.filter(pk__in=rows.values("pk")))
+        return {"total": total, "clustered": False, "clusters": [], "markers": markers}
+
+    lng_span = east - west if west <= east else 360 - (west - east)
+    cell = max(cluster_cell_degrees(zoom), (north - south) / MAX_GRID_CELLS, lng_span / MAX_GRID_CELLS)
+
+    cells = {}
+    for index, (rows, _, _) in enumerate(scoped):
+        grouped = (
+            rows.values(
+                row=Floor(Cast("latitude", FloatField()) / cell),
+                col=Floor(Cast("longitude", FloatField()) / cell),
+            )
+            .annotate(
+                count=Count("pk"), lat=Avg("latitude"), lng=Avg("longitude"), pk=Min("pk"),
+                south=Min("latitude"), north=Max("latitude"), west=Min("longitude"), east=Max("longitude"),
+            )
+        )
+        for g in grouped:
+            c = cells.setdefault((g["row"], g["col"]), {"count": 0, "lat": 0.0, "lng": 0.0, "members": []})
+            c["count"] += g["count"]
+            c["lat"] += float(g["lat"]) * g["count"]
+            c["lng"] += float(g["lng"]) * g["count"]
+            c["members"].append((index, g))
+
+    clusters, singles = [], {}
+    for c in cells.values():
+        if c["count"] == 1:
+            index, g = c["members"][0]
+            singles.setdefault(index, []).append(g["pk"])
+            continue
+        groups = [g for _, g in c["members"]]
+        clusters.append({
+            "lat": c["lat"] / c["count"],
+            "lng": c["lng"] / c["count"],
+            "count": c["count"],
+            "south": float(min(g["south"] for g in groups)),
+            "north": float(max(g["north"] for g in groups)),
+            "west": float(min(g["west"] for g in groups)),
+            "east": float(max(g["east"] for g in groups)),
+        })
+
+    markers = []
+    for index, pks in singles.items():
+        _, queryset, to_marker = scoped[index]
+        markers.extend(to_marker(row) for row in queryset.filter(pk__in=pks))
+    return {"total": total, "clustered": True, "clusters": clusters, "markers": markers}
+
+
+def markers_extent(sources):
+    """{"south", "west", "north", "east"} around every row of `sources` with coordinates, or None."""
+    boxes = []
+    for queryset, _ in sources:
+        rows = queryset.model._default_manager.filter(pk__in=queryset.values("pk")).order_by()
+        box = rows.aggregate(
+            south=Min("latitude"), north=Max("latitude"), west=Min("longitude"), east=Max("longitude"),
+        )
+        if box["south"] is not None and box["west"] is not None:
+            boxes.append(box)
+    if not boxes:
+        return None
+    return {
+        "south": float(min(b["south"] for b in boxes)),
+        "north": float(max(b["north"] for b in boxes)),
+        "west": float(min(b["west"] for b in boxes)),
+        "east": float(max(b["east"] for b in boxes)),
+    }
+
+
+def markers_response(request, sources):
+    """
+    JSON marker response for a map page: ?extent=1 returns the bounds around all results
+    (to fit the map on load); otherwise the markers for the south/west/north/east/zoom viewport.
+    """
+    if request.GET.get("extent"):
+        return JsonResponse({"ok": True, "extent": markers_extent(sources)})
+    try:
+        viewport = parse_viewport(request.GET)
+    except ValueError as e:
+        return JsonResponse({"ok": False, "error": str(e)}, status=400)
+    return JsonResponse({"ok": True, "zoom": viewport[4], **viewport_markers(sources, viewport)})
@@ -0,0 +1,101 @@
+# Materialized job/candidate skill matches (jobs_jobcandidatematch): refreshed in SQL for the
+# jobs or job seekers whose skills changed, so recommendation pages are one indexed read
+import threading
+
+from django.db import connection, transaction
+
+from .models import PREFERRED_SKILL_WEIGHT, REQUIRED_SKILL_WEIGHT
+
+MATCH_TABLE = "jobs_jobcandidatematch"
+
+# Every (job, seeker) pair sharing a skill, scored like Job.candidate_match_scores(): a skill
+# that is both required and preferred for a job counts as required only
+MATCH_SELECT = """
+    SELECT links.job_id, seeker.jobseekerprofile_id,
+           SUM(CASE WHEN links.required = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN links.required = 0 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN links.required = 1 THEN %s ELSE %s END)
+    FROM (
+        SELECT r.job_id, r.skill_id, 1 AS required FROM jobs_job_required_skills r {job_filter}
+        UNION ALL
+        SELECT p.job_id, p.skill_id, 0 AS required FROM jobs_job_preferred_skills p
+        WHERE NOT EXISTS (
+            SELECT 1 FROM jobs_job_required_skills dup WHERE dup.job_id = p.job_id AND dup.skill_id = p.skill_id
+        ) {preferred_job_filter}
+    ) AS links
+    JOIN accounts_jobseekerprofile_skills seeker ON seeker.skill_id = links.skill_id
+    {candidate_filter}
+    GROUP BY links.job_id, seeker.jobseekerprofile_id
+"""
+
+_pending = threading.local()
+
+
+def refresh_matches(job_ids=None, candidate_ids=None, conn=connection):
+    """
+    Recompute the match rows of the given jobs and/or job seekers (by id) in one
+    transaction: their rows are deleted and re-inserted from a single aggregate query.
+    With neither given, the whole table is rebuilt. Returns the number of rows written.
+    """
+    if job_ids is None and candidate_ids is None:
+        scopes = [(None, None)]
+    else:
+        scopes = []
+        if job_ids:
+            scopes.append(("job_id", sorted(set(job_ids))))
+        if candidate_ids:
+            scopes.append(("candidate_id", sorted(set(candidate_ids))))
+
+    written = 0
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        for column, ids in scopes:
+            placeholders = ", ".join(["%s"] * len(ids)) if ids else ""
+            if column is None:
+                cursor.execute(f"DELETE FROM {MATCH_TABLE}")
+                filters = {"job_filter": "", "preferred_job_filter": "", "candidate_filter": ""}
+            elif column == "job_id":
+                cursor.execute(f"DELETE FROM {MATCH_TABLE} WHERE job_id IN ({placeholders})", ids)
+                filters = {
+                    "job_filter": f"WHERE r.job_id IN ({placeholders})",
+                    "preferred_job_filter": f"AND p.job_id IN ({placeholders})",
+                    "candidate_filter": "",
+                }
+            else:
+                cursor.execute(f"DELETE FROM {MATCH_TABLE} WHERE candidate_id IN ({placeholders})", ids)
+                filters = {
+                    "job_filter": "", "preferred_job_filter": "",
+                    "candidate_filter": f"WHERE seeker.jobseekerprofile_id IN ({placeholders})",
+                }
+            params = [REQUIRED_SKILL_WEIGHT, PREFERRED_SKILL_WEIGHT]
+            if column == "job_id":
+                params += ids + ids
+            elif column == "candidate_id":
+                params += ids
+            cursor.execute(
+                f"INSERT INTO {MATCH_TABLE} (job_id, candidate_id, required_matches, preferred_matches, score) "
+                + MATCH_SELECT.format(**filters),
+                params,
+            )
+            written += cursor.rowcount
+    return written
+
+
+def refresh_matches_on_commit(job_ids=(), candidate_ids=()):
+    """
+    refresh_matches() for these jobs/seekers once the current transaction commits
+    (immediately outside one). Calls within one transaction are merged, so e.g.
+    skills.set() - a remove and an add - refreshes each job or seeker once.
+    """
+    pending = _pending.__dict__.setdefault("ids", {"job": set(), "candidate": set()})
+    pending["job"].update(job_ids)
+    pending["candidate"].update(candidate_ids)
+    transaction.on_commit(_flush_pending)
+
+
+def _flush_pending():
+    pending = getattr(_pending, "ids", None)
+    if not pending or not (pending["job"] or pending["candidate"]):
+        return  # an earlier callback of the same transaction already refreshed them
+    job_ids, candidate_ids = pending["job"], pending["candidate"]
+    _pending.ids = {"job": set(), "candidate": set()}
+    refresh_matches(job_ids=job_ids, candidate_ids=candidate_ids)
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_geocode_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommuteCalibration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grid_lat', models.IntegerField()),
+                ('grid_lng', models.IntegerField()),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('straight_miles', models.FloatField(default=0)),
+                ('road_miles', models.FloatField(default=0)),
+                ('minutes', models.FloatField(default=0)),
+                ('traffic_samples', models.PositiveIntegerField(default=0)),
+                ('traffic_road_miles', models.FloatField(default=0)),
+                ('traffic_minutes', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('grid_lat', 'grid_lng'), name='unique_commute_calibration_cell')],
+            },
+        ),
+    ]
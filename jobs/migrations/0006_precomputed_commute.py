@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_commute_calibration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecomputedCommute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origin_cell', models.CharField(max_length=12)),
+                ('dest_lat', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('dest_lng', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('distance_miles', models.FloatField()),
+                ('duration_minutes', models.FloatField(blank=True, null=True)),
+                ('duration_in_traffic_minutes', models.FloatField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='precomputed_commutes', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['origin_cell', 'distance_miles'], name='jobs_precom_origin__d4b916_idx')],
+                'constraints': [models.UniqueConstraint(fields=('origin_cell', 'job'), name='unique_precomputed_commute')],
+            },
+        ),
+    ]
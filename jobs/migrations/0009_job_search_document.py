@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# The FTS5 index and its sync triggers as jobs.search defined them at the time of this migration
+CREATE_SEARCH_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_job_fts USING fts5(
+        title, company, description, projects, content='jobs_job', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')
+    """,
+    # Make the hidden `rank` column the weighted bm25 score (title, company, description, projects)
+    "INSERT INTO jobs_job_fts(jobs_job_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 1.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ai AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts(rowid, title, company, description, projects)
+        VALUES (new.id, new.title, new.company, new.description, new.projects);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ad AFTER DELETE ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts(jobs_job_fts, rowid, title, company, description, projects)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.projects);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_au AFTER UPDATE OF title, company, description, projects ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts(jobs_job_fts, rowid, title, company, description, projects)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.projects);
+        INSERT INTO jobs_job_fts(rowid, title, company, description, projects)
+        VALUES (new.id, new.title, new.company, new.description, new.projects);
+    END
+    """,
+    # Index the jobs that already exist
+    "INSERT INTO jobs_job_fts(jobs_job_fts) VALUES ('rebuild')",
+]
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 table + sync triggers on jobs_job, filled from existing jobs (SQLite only)
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in CREATE_SEARCH_INDEX_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name in ("jobs_job_fts_ai", "jobs_job_fts_ad", "jobs_job_fts_au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    schema_editor.execute("DROP TABLE IF EXISTS jobs_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='jobs.job')),
+                ('title', models.TextField()),
+                ('company', models.TextField()),
+                ('description', models.TextField()),
+                ('projects', models.TextField()),
+                ('query', models.TextField(db_column='jobs_job_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'jobs_job_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:27
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Same rules as jobs.utils.is_remote_location at the time of this migration
+REMOTE_LOCATION_TERMS = ("remote", "work from home", "wfh", "anywhere")
+
+
+def is_remote_location(location):
+    text = unicodedata.normalize("NFKC", location or "").lower()
+    text = re.sub(r"[^\w\s,#-]", " ", text)
+    text = re.sub(r"\s*,\s*", ", ", text)
+    text = re.sub(r"\s+", " ", text)
+    text = text.strip(" ,")[:255]
+    return any(term in text for term in REMOTE_LOCATION_TERMS)
+
+
+def fill_is_remote(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    remote_ids = [
+        pk for pk, location in Job.objects.values_list("pk", "location").iterator()
+        if is_remote_location(location)
+    ]
+    for start in range(0, len(remote_ids), 500):
+        Job.objects.filter(pk__in=remote_ids[start:start + 500]).update(is_remote=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_job_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='is_remote',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(fill_is_remote, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_remote', True)), fields=['created_at', 'id'], name='job_remote_created_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:28
+
+from django.db import migrations, models
+from django.db.models import F
+
+# Same multipliers as jobs.models.ANNUAL_PAY_FACTORS at the time of this migration
+ANNUAL_PAY_FACTORS = {'annual': 1, 'hourly': 2080, 'monthly': 12}
+
+
+def fill_annual_pay(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    for pay_type, factor in ANNUAL_PAY_FACTORS.items():
+        Job.objects.filter(pay_type=pay_type).update(
+            annual_pay_min=F("pay_min") * factor, annual_pay_max=F("pay_max") * factor,
+        )
+    Job.objects.exclude(pay_type__in=list(ANNUAL_PAY_FACTORS)).update(
+        annual_pay_min=F("pay_min"), annual_pay_max=F("pay_max"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_is_remote'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='annual_pay_max',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='annual_pay_min',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.RunPython(fill_annual_pay, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['annual_pay_min', 'id'], name='jobs_job_annual__2ba515_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['annual_pay_max', 'id'], name='jobs_job_annual__af5bbf_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Same weights as jobs.models.REQUIRED_SKILL_WEIGHT / PREFERRED_SKILL_WEIGHT at the time of this migration
+REQUIRED_SKILL_WEIGHT = 3
+PREFERRED_SKILL_WEIGHT = 1
+
+# Every (job, seeker) pair sharing a skill; a skill both required and preferred counts as required
+FILL_MATCHES_SQL = """
+    INSERT INTO jobs_jobcandidatematch (job_id, candidate_id, required_matches, preferred_matches, score)
+    SELECT links.job_id, seeker.jobseekerprofile_id,
+           SUM(CASE WHEN links.required = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN links.required = 0 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN links.required = 1 THEN %s ELSE %s END)
+    FROM (
+        SELECT r.job_id, r.skill_id, 1 AS required FROM jobs_job_required_skills r
+        UNION ALL
+        SELECT p.job_id, p.skill_id, 0 AS required FROM jobs_job_preferred_skills p
+        WHERE NOT EXISTS (
+            SELECT 1 FROM jobs_job_required_skills dup WHERE dup.job_id = p.job_id AND dup.skill_id = p.skill_id
+        )
+    ) AS links
+    JOIN accounts_jobseekerprofile_skills seeker ON seeker.skill_id = links.skill_id
+    GROUP BY links.job_id, seeker.jobseekerprofile_id
+"""
+
+
+def fill_matches(apps, schema_editor):
+    # Score every existing (job, seeker) pair that shares a skill. Databases built from the
+    # accounts migrations alone have no seeker skills table yet: nothing to score there
+    # (`manage.py rebuild_candidate_matches` fills the table once it exists).
+    if "accounts_jobseekerprofile_skills" not in schema_editor.connection.introspection.table_names():
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(FILL_MATCHES_SQL, [REQUIRED_SKILL_WEIGHT, PREFERRED_SKILL_WEIGHT])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0011_job_annual_pay'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCandidateMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('required_matches', models.PositiveIntegerField(default=0)),
+                ('preferred_matches', models.PositiveIntegerField(default=0)),
+                ('score', models.PositiveIntegerField(default=0)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_matches', to='accounts.jobseekerprofile')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_matches', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', '-score', '-required_matches', 'candidate'], name='job_match_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'candidate'), name='job_candidate_match_unique')],
+            },
+        ),
+        migrations.RunPython(fill_matches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0012_job_candidate_match'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geocodetask',
+            name='jobseeker',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='geocode_task', to='accounts.jobseekerprofile'),
+        ),
+        migrations.AddField(
+            model_name='geocodetask',
+            name='recruiter',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='geocode_task', to='accounts.recruiterprofile'),
+        ),
+        migrations.AlterField(
+            model_name='geocodetask',
+            name='job',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='geocode_task', to='jobs.job'),
+        ),
+        migrations.AddConstraint(
+            model_name='geocodetask',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('job__isnull', False), ('jobseeker__isnull', True), ('recruiter__isnull', True)), models.Q(('job__isnull', True), ('jobseeker__isnull', False), ('recruiter__isnull', True)), models.Q(('job__isnull', True), ('jobseeker__isnull', True), ('recruiter__isnull', False)), _connector='OR'), name='geocode_task_one_target'),
+        ),
+    ]
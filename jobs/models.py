@@ -2,10 +2,13 @@ from django.db import models
 from django.conf import settings
 from django.db.models.signals import post_migrate
 from django.dispatch import receiver
+from django.utils import timezone
+import math
+from datetime import datetime, timedelta
 from decimal import Decimal
-import requests
-from .utils import haversine
-from django.db.models import Count  
+from .utils import bounding_box, grid_cell, is_remote_location, normalize_address
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
 from accounts.models import JobSeekerProfile 
 
 # Import the recruiter profile correctly
@@ -19,6 +22,25 @@ PAY_TYPE_CHOICES = [
     ('monthly', 'Monthly'),
 ]
 
+# Weight of each matching skill in a candidate's match score (Job.get_recommended_candidates)
+REQUIRED_SKILL_WEIGHT = 3
+PREFERRED_SKILL_WEIGHT = 1
+
+# Multiplier from each pay type to a yearly amount (hourly: 40 h x 52 weeks)
+ANNUAL_PAY_FACTORS = {
+    'annual': 1,
+    'hourly': 2080,
+    'monthly': 12,
+}
+
+# Orderings for the jobs index sort options; the last field keeps each order total (keyset paging)
+JOB_SORTS = {
+    "newest": ("-created_at", "-id"),
+    "oldest": ("created_at", "id"),
+    "salary_high": ("-annual_pay_max", "-id"),
+    "salary_low": ("annual_pay_min", "id"),
+}
+
 # Default skills list for initial population
 PREDEFINED_SKILLS = [
     # Programming Languages
@@ -67,15 +89,78 @@ class Skill(models.Model):
         return self.name
 
 
+def haversine_sql(lat, lng):
+    """Great-circle distance in miles from lat/lng to each row's coordinates, as a SQL expression."""
+    R = 3958.8  # miles
+    row_lat = Radians(Cast(F("latitude"), FloatField()))
+    row_lng = Radians(Cast(F("longitude"), FloatField()))
+    origin_lat = math.radians(float(lat))
+    origin_lng = math.radians(float(lng))
+    a = (
+        Power(Sin((row_lat - origin_lat) / 2), 2)
+        + math.cos(origin_lat) * Cos(row_lat) * Power(Sin((row_lng - origin_lng) / 2), 2)
+    )
+    return 2 * R * ASin(Sqrt(a))
+
+
 class JobQuerySet(models.QuerySet):
+    def within_bounding_box(self, lat, lng, radius):
+        """
+        Jobs inside the lat/lng box around a circle of `radius` miles: an indexed,
+        cheap superset of the jobs within the radius.
+        """
+        (lat_min, lat_max), (lng_min, lng_max) = bounding_box(lat, lng, radius)
+        return self.filter(
+            latitude__range=(lat_min, lat_max),
+            longitude__range=(lng_min, lng_max),
+        )
+
+    def keyset_page(self, after=None, page_size=20, ordering=None):
+        """
+        One page of jobs in `ordering` (a JOB_SORTS value; newest first by default). `after`
+        is Job.keyset_values() of the last job on the previous page. Returns (jobs, has_next).
+        """
+        ordering = ordering or JOB_SORTS["newest"]
+        jobs = self.order_by(*ordering)
+        if after is not None:
+            # (a, b) after (x, y): a beyond x, or a == x and b beyond y
+            names = [f.lstrip("-") for f in ordering]
+            values = [Job._meta.get_field(name).to_python(value) for name, value in zip(names, after)]
+            keyset = Q()
+            for i, field in enumerate(ordering):
+                op = "lt" if field.startswith("-") else "gt"
+                step = Q(**{f"{names[i]}__{op}": values[i]})
+                for name, value in zip(names[:i], values[:i]):
+                    step &= Q(**{name: value})
+                keyset |= step
+            jobs = jobs.filter(keyset)
+        page = list(jobs[:page_size + 1])
+        return page[:page_size], len(page) > page_size
+
+    def search_page(self, after=None, page_size=20):
+        """
+        One page of full-text search results (jobs.search), best match first, ordered by
+        (search_rank, id). `after` is the (search_rank, id) of the last job on the previous page.
+        Returns (jobs, has_next).
+        """
+        jobs = self.order_by("search_rank", "id")
+        if after is not None:
+            rank, pk = after
+            jobs = jobs.filter(Q(search_rank__gt=rank) | Q(search_rank=rank, id__gt=pk))
+        page = list(jobs[:page_size + 1])
+        return page[:page_size], len(page) > page_size
+
     def filter_within_radius(self, lat, lng, radius):
-        job_ids = []
-        for job in self:
-            if job.latitude and job.longitude:
-                distance = haversine(lng, lat, job.longitude, job.latitude)
-                if distance <= radius:
-                    job_ids.append(job.id)
-        return self.filter(id__in=job_ids)
+        """
+        Jobs within `radius` miles of lat/lng, annotated with `distance_miles`.
+        The bounding box narrows the rows through the lat/lng index first, and
+        the exact distance check runs in the same SQL query.
+        """
+        return (
+            self.within_bounding_box(lat, lng, radius)
+            .annotate(distance_miles=haversine_sql(lat, lng))
+            .filter(distance_miles__lte=float(radius))
+        )
 
 
 class Job(models.Model):
@@ -114,37 +199,515 @@ class Job(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Remote job, derived from the location text on save (see jobs.utils.is_remote_location)
+    is_remote = models.BooleanField(default=False, editable=False)
+
+    # Pay range as yearly amounts whatever the pay type, for cross-type salary filters and sorts
+    annual_pay_min = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
+    annual_pay_max = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
+
+    # Denormalized columns recomputed by refresh_derived_fields()
+    DERIVED_FIELDS = ("is_remote", "annual_pay_min", "annual_pay_max")
+
     objects = JobQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["latitude", "longitude"]),
+            models.Index(fields=["created_at", "id"]),
+            # Partial index: remote jobs only, newest first for the remote search
+            models.Index(fields=["created_at", "id"], condition=Q(is_remote=True), name="job_remote_created_idx"),
+            models.Index(fields=["annual_pay_min", "id"]),
+            models.Index(fields=["annual_pay_max", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.title} | {self.company}"
 
+    def refresh_derived_fields(self):
+        """Recompute the denormalized columns derived from other fields."""
+        self.is_remote = is_remote_location(self.location)
+        factor = ANNUAL_PAY_FACTORS.get(self.pay_type, 1)
+        self.annual_pay_min = Decimal(self.pay_min or 0) * factor
+        self.annual_pay_max = Decimal(self.pay_max or 0) * factor
+
+    def keyset_values(self, ordering):
+        """JSON-safe sort key of this job in `ordering`, for JobQuerySet.keyset_page(after=...)."""
+        values = []
+        for name in (f.lstrip("-") for f in ordering):
+            value = getattr(self, name)
+            values.append(value.isoformat() if isinstance(value, datetime) else str(value) if isinstance(value, Decimal) else value)
+        return values
+
+    @property
+    def geocode_query(self):
+        """Address text used to look up coordinates for this job."""
+        return self.location
+
+    @property
+    def needs_geocoding(self):
+        # "Remote", "Anywhere", ... are not places (same rule as is_remote and the importer)
+        if not self.location or is_remote_location(self.location):
+            return False
+        return not self.latitude or not self.longitude
+
     def save(self, *args, **kwargs):
-        if self.location and (not self.latitude or not self.longitude):
-            try:
-                api_key = getattr(settings, "GOOGLE_MAPS_API_KEY_BACKEND", None)
-                if api_key:
-                    url = f"https://maps.googleapis.com/maps/api/geocode/json?address={self.location}&key={api_key}"
-                    response = requests.get(url)
-                    data = response.json()
-                    if data["status"] == "OK":
-                        coords = data["results"][0]["geometry"]["location"]
-                        self.latitude = Decimal(str(coords["lat"]))
-                        self.longitude = Decimal(str(coords["lng"]))
-            except Exception as e:
-                print(f"Geocoding failed for {self.location}: {e}")
+        # Locations already in the geocode cache are resolved here; anything else is
+        # geocoded by the background worker (see jobs.geocoding) after the job is saved.
+        extra_fields = set(self.DERIVED_FIELDS)
+        queue_geocode = False
+        if self.needs_geocoding:
+            found, coords = GeocodeCache.lookup(self.location)
+            if coords is not None:
+                self.latitude, self.longitude = coords
+                extra_fields |= {"latitude", "longitude"}
+            queue_geocode = not found
+
+        self.refresh_derived_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | extra_fields
         super().save(*args, **kwargs)
+
+        if queue_geocode:
+            GeocodeTask.enqueue(self)
     
-    def get_recommended_candidates(self):
-        job_skills = self.skills.all()
+    def candidate_match_scores(self, candidates=None):
+        """
+        Weighted skill overlap of job seekers with this job, best match first, as a values()
+        queryset of {"candidate_id", "required_matches", "preferred_matches", "match_score"}.
+        A matching required skill scores REQUIRED_SKILL_WEIGHT and a preferred one
+        PREFERRED_SKILL_WEIGHT (a skill listed as both counts as required). Computed in one
+        aggregate query over the seekers' skill links, grouped by seeker, so only seekers
+        sharing a skill are read. `candidates` restricts it to a JobSeekerProfile queryset.
+        This is the live computation; JobCandidateMatch keeps the same scores for page reads.
+        """
+        required = Job.required_skills.through.objects.filter(job=self).values("skill_id")
+        preferred = (
+            Job.preferred_skills.through.objects.filter(job=self)
+            .exclude(skill_id__in=required).values("skill_id")
+        )
+        links = JobSeekerProfile.skills.through.objects.filter(Q(skill_id__in=required) | Q(skill_id__in=preferred))
+        if candidates is not None:
+            links = links.filter(jobseekerprofile__in=candidates)
         return (
-            JobSeekerProfile.objects
-            .filter(skills__in=job_skills)
-            .distinct()
-            .annotate(matches=Count('skills'))
-            .order_by('-matches')
+            links
+            .values(candidate_id=F("jobseekerprofile_id"))
+            .annotate(
+                required_matches=Count("pk", filter=Q(skill_id__in=required)),
+                preferred_matches=Count("pk", filter=Q(skill_id__in=preferred)),
+            )
+            .annotate(match_score=(
+                F("required_matches") * REQUIRED_SKILL_WEIGHT + F("preferred_matches") * PREFERRED_SKILL_WEIGHT
+            ))
+            .order_by("-match_score", "-required_matches", "candidate_id")
         )
 
+    def ranked_matches(self, candidates=None):
+        """
+        This job's JobCandidateMatch rows, best match first (an indexed read). `candidates`
+        restricts them to a JobSeekerProfile queryset.
+        """
+        matches = self.candidate_matches.order_by("-score", "-required_matches", "candidate_id")
+        if candidates is not None:
+            matches = matches.filter(candidate__in=candidates)
+        return matches
+
+    def get_recommended_candidates(self, candidates=None, limit=None):
+        """
+        The `limit` (default all) best matching job seekers for this job, as a list of
+        JobSeekerProfiles carrying required_matches, preferred_matches and match_score,
+        read from the materialized JobCandidateMatch table.
+        """
+        matches = self.ranked_matches(candidates)
+        return _matched_profiles(matches[:limit] if limit else matches)
+
+    def recommended_candidates_page(self, after=None, page_size=20, candidates=None):
+        """
+        One page of get_recommended_candidates(candidates). `after` is the (match_score,
+        required_matches, id) of the last candidate on the previous page.
+        Returns (candidates, has_next).
+        """
+        matches = self.ranked_matches(candidates)
+        if after is not None:
+            score, required, pk = after
+            matches = matches.filter(
+                Q(score__lt=score)
+                | Q(score=score, required_matches__lt=required)
+                | Q(score=score, required_matches=required, candidate_id__gt=pk)
+            )
+        page = _matched_profiles(matches[:page_size + 1])
+        return page[:page_size], len(page) > page_size
+
+
+def _matched_profiles(matches):
+    """The JobSeekerProfiles (with user and skills loaded) of JobCandidateMatch rows, in order, carrying the scores."""
+    ranked = []
+    for match in matches.select_related("candidate__user").prefetch_related("candidate__skills"):
+        profile = match.candidate
+        profile.required_matches = match.required_matches
+        profile.preferred_matches = match.preferred_matches
+        profile.match_score = match.score
+        ranked.append(profile)
+    return ranked
+
+
+class JobCandidateMatch(models.Model):
+    """
+    Materialized skill match of a job seeker with a job, scored as in
+    Job.candidate_match_scores(); only pairs sharing a skill have a row. Kept current by
+    jobs.matching from the skill m2m signals (see jobs/signals.py); rebuild it with
+    `manage.py rebuild_candidate_matches`.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="candidate_matches")
+    candidate = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, related_name="job_matches")
+    required_matches = models.PositiveIntegerField(default=0)
+    preferred_matches = models.PositiveIntegerField(default=0)
+    score = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "candidate"], name="job_candidate_match_unique"),
+        ]
+        indexes = [
+            # Recommendation pages: one job's matches, best first
+            models.Index(fields=["job", "-score", "-required_matches", "candidate"], name="job_match_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_id} -> job {self.job_id} ({self.score})"
+
+
+class GeocodeCache(models.Model):
+    """
+    Geocoding results keyed by normalized address, shared by jobs and profiles.
+    A row without coordinates records an address with no match.
+    """
+    address_key = models.CharField(max_length=255, unique=True)
+    address = models.CharField(max_length=255)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+    miss_count = models.PositiveIntegerField(default=0)
+    resolved_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.address_key} -> {self.coords}"
+
+    @property
+    def coords(self):
+        if self.latitude is None or self.longitude is None:
+            return None
+        return self.latitude, self.longitude
+
+    @classmethod
+    def ttl(cls):
+        return timedelta(days=getattr(settings, "GEOCODE_CACHE_TTL_DAYS", 180))
+
+    @classmethod
+    def lookup_many(cls, addresses, count_hits=True):
+        """
+        Return {address: coords or None} for every address with a fresh cache entry.
+        Addresses missing from the result have never been resolved or have expired.
+        """
+        keys = {}
+        for address in addresses:
+            key = normalize_address(address)
+            if key:
+                keys.setdefault(key, []).append(address)
+        if not keys:
+            return {}
+
+        fresh_after = timezone.now() - cls.ttl()
+        entries = list(cls.objects.filter(address_key__in=list(keys), resolved_at__gte=fresh_after))
+        if count_hits and entries:
+            cls.objects.filter(pk__in=[e.pk for e in entries]).update(hit_count=F("hit_count") + 1)
+
+        found = {}
+        for entry in entries:
+            for address in keys[entry.address_key]:
+                found[address] = entry.coords
+        return found
+
+    @classmethod
+    def lookup(cls, address, count_hits=True):
+        """Return (found, coords) for one address."""
+        found = cls.lookup_many([address], count_hits=count_hits)
+        return address in found, found.get(address)
+
+    @classmethod
+    def store(cls, address, coords):
+        """Record a fresh geocoding result (coords may be None for "no match")."""
+        key = normalize_address(address)
+        if not key:
+            return
+        lat, lng = coords if coords is not None else (None, None)
+        updated = cls.objects.filter(address_key=key).update(
+            address=address[:255], latitude=lat, longitude=lng,
+            miss_count=F("miss_count") + 1, resolved_at=timezone.now(),
+        )
+        if not updated:
+            cls.objects.get_or_create(
+                address_key=key,
+                defaults={"address": address[:255], "latitude": lat, "longitude": lng, "miss_count": 1},
+            )
+
+
+class GeocodeTask(models.Model):
+    """
+    A job or profile waiting for its address (geocode_query) to be geocoded by the
+    background worker. Exactly one of job, jobseeker and recruiter is set.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    # The field holding each kind of queued object
+    TARGET_FIELDS = {
+        "Job": "job",
+        "JobSeekerProfile": "jobseeker",
+        "RecruiterProfile": "recruiter",
+    }
+
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name="geocode_task", null=True, blank=True)
+    jobseeker = models.OneToOneField(
+        JobSeekerProfile, on_delete=models.CASCADE, related_name="geocode_task", null=True, blank=True,
+    )
+    recruiter = models.OneToOneField(
+        RecruiterProfile, on_delete=models.CASCADE, related_name="geocode_task", null=True, blank=True,
+    )
+    location = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    Q(job__isnull=False, jobseeker__isnull=True, recruiter__isnull=True)
+                    | Q(job__isnull=True, jobseeker__isnull=False, recruiter__isnull=True)
+                    | Q(job__isnull=True, jobseeker__isnull=True, recruiter__isnull=False)
+                ),
+                name="geocode_task_one_target",
+            ),
+        ]
+
+    def __str__(self):
+        field = self.target_field
+        return f"Geocode {self.location!r} for {field} {getattr(self, f'{field}_id')} ({self.status})"
+
+    @property
+    def target_field(self):
+        for field in self.TARGET_FIELDS.values():
+            if getattr(self, f"{field}_id") is not None:
+                return field
+        return None
+
+    @property
+    def target(self):
+        """The queued job or profile."""
+        field = self.target_field
+        return getattr(self, field) if field else None
+
+    @classmethod
+    def enqueue(cls, obj, force=False):
+        """
+        Queue a job or profile for geocoding of its geocode_query. An existing task for
+        the same address is left alone (so re-saving does not reset a retry backoff or
+        retry a failed address) unless `force`; a changed address re-queues it afresh.
+        """
+        field = cls.TARGET_FIELDS[type(obj).__name__]
+        location = (obj.geocode_query or "")[:255]
+        task = cls.objects.filter(**{field: obj}).first()
+        if task is not None and task.location == location and not force:
+            return task
+        task, _ = cls.objects.update_or_create(
+            **{field: obj},
+            defaults={
+                "location": location,
+                "status": cls.STATUS_PENDING,
+                "attempts": 0,
+                "next_attempt_at": timezone.now(),
+                "claim_token": "",
+                "last_error": "",
+            },
+        )
+        return task
+
+
+class CommuteCalibration(models.Model):
+    """
+    Running totals of real Distance Matrix results per origin grid cell, used by
+    jobs.utils.CalibratedCommuteBackend to turn straight-line distances into road
+    distances (circuity) and drive times (average speed) without calling the API.
+    """
+    grid_lat = models.IntegerField()
+    grid_lng = models.IntegerField()
+    samples = models.PositiveIntegerField(default=0)
+    straight_miles = models.FloatField(default=0)
+    road_miles = models.FloatField(default=0)
+    minutes = models.FloatField(default=0)
+    traffic_samples = models.PositiveIntegerField(default=0)
+    traffic_road_miles = models.FloatField(default=0)
+    traffic_minutes = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Straight-line hops shorter than this are dominated by street layout noise
+    MIN_STRAIGHT_MILES = 0.25
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["grid_lat", "grid_lng"], name="unique_commute_calibration_cell"),
+        ]
+
+    def __str__(self):
+        return f"Cell ({self.grid_lat}, {self.grid_lng}): {self.samples} samples"
+
+    @classmethod
+    def record(cls, origin_lat, origin_lng, samples):
+        """
+        Add (straight_miles, result) pairs for one origin to its cell's totals.
+        Only Distance Matrix results with status OK are counted.
+        """
+        totals = {"samples": 0, "straight_miles": 0.0, "road_miles": 0.0, "minutes": 0.0,
+                  "traffic_samples": 0, "traffic_road_miles": 0.0, "traffic_minutes": 0.0}
+        for straight, result in samples:
+            road, minutes = result.get("distance_miles"), result.get("duration_minutes")
+            if result.get("status") != "OK" or road is None or minutes is None or straight < cls.MIN_STRAIGHT_MILES:
+                continue
+            totals["samples"] += 1
+            totals["straight_miles"] += straight
+            totals["road_miles"] += road
+            totals["minutes"] += minutes
+            traffic = result.get("duration_in_traffic_minutes")
+            if traffic is not None:
+                totals["traffic_samples"] += 1
+                totals["traffic_road_miles"] += road
+                totals["traffic_minutes"] += traffic
+        if not totals["samples"]:
+            return
+
+        row, col = grid_cell(origin_lat, origin_lng)
+        updated = cls.objects.filter(grid_lat=row, grid_lng=col).update(
+            **{field: F(field) + value for field, value in totals.items()}, updated_at=timezone.now()
+        )
+        if not updated:
+            calibration, created = cls.objects.get_or_create(grid_lat=row, grid_lng=col, defaults=totals)
+            if not created:
+                cls.objects.filter(pk=calibration.pk).update(**{field: F(field) + value for field, value in totals.items()})
+
+    @classmethod
+    def profile(cls, origin_lat, origin_lng, min_samples=20):
+        """
+        Calibration for an origin: its own cell when it has enough samples, otherwise
+        the totals over all cells. None when there is not enough data anywhere.
+        """
+        row, col = grid_cell(origin_lat, origin_lng)
+        cell = cls.objects.filter(grid_lat=row, grid_lng=col).values(
+            "samples", "straight_miles", "road_miles", "minutes",
+            "traffic_samples", "traffic_road_miles", "traffic_minutes",
+        ).first()
+        if cell is None or cell["samples"] < min_samples:
+            cell = cls.objects.aggregate(
+                samples=Sum("samples"), straight_miles=Sum("straight_miles"), road_miles=Sum("road_miles"),
+                minutes=Sum("minutes"), traffic_samples=Sum("traffic_samples"),
+                traffic_road_miles=Sum("traffic_road_miles"), traffic_minutes=Sum("traffic_minutes"),
+            )
+            if not cell["samples"] or cell["samples"] < min_samples:
+                return None
+
+        profile = {
+            "circuity": cell["road_miles"] / cell["straight_miles"],
+            "mph": cell["road_miles"] / (cell["minutes"] / 60.0),
+            "traffic_mph": None,
+        }
+        if cell["traffic_samples"] and cell["traffic_minutes"]:
+            profile["traffic_mph"] = cell["traffic_road_miles"] / (cell["traffic_minutes"] / 60.0)
+        return profile
+
+
+class PrecomputedCommute(models.Model):
+    """
+    Road distance/time from a popular origin cell (settings.COMMUTE_POPULAR_ORIGINS) to a job,
+    filled by `manage.py precompute_commutes`. dest_lat/dest_lng record the job coordinates
+    the row was computed for, so rows for jobs that have since moved are never used.
+    """
+    origin_cell = models.CharField(max_length=12)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="precomputed_commutes")
+    dest_lat = models.DecimalField(max_digits=9, decimal_places=6)
+    dest_lng = models.DecimalField(max_digits=9, decimal_places=6)
+    distance_miles = models.FloatField()
+    duration_minutes = models.FloatField(null=True, blank=True)
+    duration_in_traffic_minutes = models.FloatField(null=True, blank=True)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["origin_cell", "job"], name="unique_precomputed_commute"),
+        ]
+        indexes = [
+            models.Index(fields=["origin_cell", "distance_miles"]),
+        ]
+
+    def __str__(self):
+        return f"{self.origin_cell} -> job {self.job_id}: {self.distance_miles:.1f} mi"
+
+    def as_result(self):
+        """The result dict shape used by jobs.utils commute backends."""
+        return {
+            "status": "OK",
+            "distance_miles": self.distance_miles,
+            "duration_minutes": self.duration_minutes,
+            "duration_in_traffic_minutes": self.duration_in_traffic_minutes,
+            "error": None,
+        }
+
+
+class ResultCacheVersion(models.Model):
+    """
+    A named version counter for cached query results (see jobs/result_cache.py). It lives in
+    the database rather than the cache, so a bump from any process (web workers, management
+    commands, the geocode worker) is seen by every process serving cached pages.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class JobSearchDocument(models.Model):
+    """
+    A row of the SQLite FTS5 full-text index over Job title/company/description/projects
+    (see jobs/search.py). The virtual table is created by migration and kept in sync by
+    database triggers on jobs_job, so Django never writes it; the ORM only joins to it.
+    Filtering on `query` runs an FTS5 MATCH; `rank` is the weighted bm25 score (lower is better).
+    """
+    job = models.OneToOneField(
+        Job, on_delete=models.DO_NOTHING, primary_key=True, db_column="rowid", related_name="search_document",
+    )
+    title = models.TextField()
+    company = models.TextField()
+    description = models.TextField()
+    projects = models.TextField()
+    query = models.TextField(db_column="jobs_job_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "jobs_job_fts"
+
 
 @receiver(post_migrate)
 def create_default_skills(sender, **kwargs):
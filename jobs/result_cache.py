@@ -0,0 +1,72 @@
+# Versioned cache for jobs query results. Every key embeds a global jobs version that
+# jobs/signals.py bumps whenever a job or its skills change, so after any change the old
+# entries are never read again (they expire on their own) and results stay fresh. The
+# version is a database row, so bumps reach every process whatever the cache backend.
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import OperationalError, ProgrammingError, transaction
+from django.db.models import F
+
+from .models import ResultCacheVersion
+
+JOBS_VERSION_NAME = "jobs"
+
+
+def _new_version():
+    # Start from the clock, so a counter row that was lost never falls back to a
+    # number that entries still in the cache were stored under
+    return time.time_ns() // 1000
+
+
+def jobs_version():
+    """Current global jobs version."""
+    version = (
+        ResultCacheVersion.objects.filter(name=JOBS_VERSION_NAME)
+        .values_list("version", flat=True).first()
+    )
+    if version is None:
+        row, _ = ResultCacheVersion.objects.get_or_create(
+            name=JOBS_VERSION_NAME, defaults={"version": _new_version()},
+        )
+        version = row.version
+    return version
+
+
+def bump_jobs_version():
+    """Invalidate every cached jobs query result. Call after changes that skip model signals (bulk_create, update())."""
+    try:
+        with transaction.atomic():
+            updated = ResultCacheVersion.objects.filter(name=JOBS_VERSION_NAME).update(version=F("version") + 1)
+    except (OperationalError, ProgrammingError):
+        # Database migrated back to before the version table (e.g. post_migrate creating the
+        # default skills): nothing can have been cached under a version that does not exist
+        return
+    if not updated:
+        jobs_version()  # no version stored yet: the fresh clock-based one is already newer
+
+
+def query_cache_key(prefix, params, names=None):
+    """
+    Cache key for the query `params` (a QueryDict) at the current jobs version, independent
+    of param order and empty values. Only `names` are considered if given, else every param.
+    """
+    normalized = {}
+    for name in sorted(params.keys() if names is None else names):
+        values = sorted({v.strip() for v in params.getlist(name) if v.strip()})
+        if values:
+            normalized[name] = values
+    digest = hashlib.md5(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+    return f"{prefix}:{jobs_version()}:{digest}"
+
+
+def cached_query(prefix, params, compute, timeout, names=None):
+    """compute() for the query `params`, cached for `timeout` seconds at the current jobs version."""
+    key = query_cache_key(prefix, params, names)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, timeout)
+    return result
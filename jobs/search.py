@@ -0,0 +1,125 @@
+# Full-text job search: pluggable backends, SQLite FTS5 by default
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.utils.module_loading import import_string
+
+FTS_TABLE = "jobs_job_fts"
+FTS_COLUMNS = ("title", "company", "description", "projects")
+# bm25 column weights, in FTS_COLUMNS order: a title match outranks a description match
+FTS_WEIGHTS = (10.0, 5.0, 1.0, 1.0)
+
+# Triggers on jobs_job that keep the external-content FTS table in sync; they also cover
+# bulk_create(), queryset.update() and raw SQL, which model signals would miss.
+FTS_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON jobs_job BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, company, description, projects)
+            VALUES (new.id, new.title, new.company, new.description, new.projects);
+        END""",
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON jobs_job BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, description, projects)
+            VALUES ('delete', old.id, old.title, old.company, old.description, old.projects);
+        END""",
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, company, description, projects ON jobs_job BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, description, projects)
+            VALUES ('delete', old.id, old.title, old.company, old.description, old.projects);
+            INSERT INTO {FTS_TABLE}(rowid, title, company, description, projects)
+            VALUES (new.id, new.title, new.company, new.description, new.projects);
+        END""",
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def install_search_index(conn=connection):
+    """
+    Create the FTS5 table and its triggers if missing (SQLite only). If anything had to be
+    created - e.g. a table rebuild during a migration dropped the triggers - the index is
+    rebuilt from jobs_job. Returns True if the index was (re)built.
+    """
+    if conn.vendor != "sqlite":
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE (type = 'table' AND name = %s) OR (type = 'trigger' AND name IN (%s, %s, %s))",
+            [FTS_TABLE, *FTS_TRIGGERS],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing == {FTS_TABLE, *FTS_TRIGGERS}:
+            return False
+
+        if FTS_TABLE not in existing:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"{', '.join(FTS_COLUMNS)}, content='jobs_job', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            # Make the hidden `rank` column the weighted bm25 score
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', %s)",
+                [f"bm25({', '.join(str(w) for w in FTS_WEIGHTS)})"],
+            )
+        for sql in FTS_TRIGGERS.values():
+            cursor.execute(sql)
+    rebuild_search_index(conn)
+    return True
+
+
+def rebuild_search_index(conn=connection, optimize=False):
+    """Re-index every job from jobs_job (and optionally merge the index b-trees)."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        if optimize:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def fts_query(text):
+    """
+    FTS5 query for free text: every word must match, each as a prefix
+    ("data eng" -> '"data"* AND "eng"*'). Returns "" if the text has no words.
+    """
+    return " AND ".join(f'"{token}"*' for token in _TOKEN_RE.findall(text.lower()))
+
+
+class SubstringSearchBackend:
+    """Unranked case-insensitive substring match; works on any database."""
+
+    def search(self, queryset, text):
+        return queryset.filter(
+            Q(title__icontains=text) | Q(company__icontains=text)
+            | Q(description__icontains=text) | Q(projects__icontains=text)
+        )
+
+
+class SQLiteFTSSearchBackend:
+    """
+    Ranked, prefix-aware search through the jobs_job_fts FTS5 index (JobSearchDocument).
+    Results are annotated with `search_rank` (lower is better). Falls back to
+    SubstringSearchBackend on other databases or when the text has no words.
+    """
+
+    def search(self, queryset, text):
+        query = fts_query(text)
+        if connection.vendor != "sqlite" or not query:
+            return SubstringSearchBackend().search(queryset, text)
+        return queryset.filter(search_document__query=query).annotate(search_rank=F("search_document__rank"))
+
+
+def get_search_backend():
+    """Instantiate the backend named by settings.JOB_SEARCH_BACKEND."""
+    return import_string(getattr(settings, "JOB_SEARCH_BACKEND", "jobs.search.SQLiteFTSSearchBackend"))()
+
+
+def search_jobs(queryset, text):
+    """Jobs in `queryset` matching the free-text search `text`."""
+    return get_search_backend().search(queryset, text)
+
+
+def is_ranked(queryset):
+    """True if `queryset` carries a search_rank to order by (see JobQuerySet.search_page)."""
+    return "search_rank" in queryset.query.annotations
@@ -0,0 +1,104 @@
+from django.db import connections
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.models import JobSeekerProfile
+
+from .matching import refresh_matches_on_commit
+from .models import Job, PrecomputedCommute, Skill
+from .result_cache import bump_jobs_version
+from .search import install_search_index
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(m2m_changed, sender=Job.required_skills.through)
+@receiver(m2m_changed, sender=Job.preferred_skills.through)
+def invalidate_job_results(sender, action=None, **kwargs):
+    """Any change to jobs or their skills invalidates the cached jobs query results."""
+    if action is not None and not action.startswith("post_"):
+        return  # m2m_changed also fires before the change
+    bump_jobs_version()
+
+
+@receiver(m2m_changed, sender=Job.required_skills.through)
+@receiver(m2m_changed, sender=Job.preferred_skills.through)
+@receiver(m2m_changed, sender=JobSeekerProfile.skills.through)
+def refresh_skill_matches(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep JobCandidateMatch current when a job's required/preferred skills or a seeker's
+    skills change. From the skill side (reverse), the jobs/seekers in pk_set changed; a
+    reverse clear() has no pk_set, so the affected ids are collected before it runs.
+    """
+    side = "candidate" if sender is JobSeekerProfile.skills.through else "job"
+    if action == "pre_clear" and reverse:
+        related = instance.jobseekers if side == "candidate" else (
+            instance.required_for_jobs if sender is Job.required_skills.through else instance.preferred_for_jobs
+        )
+        instance._cleared_match_ids = list(related.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        ids = [instance.pk]
+    elif action == "post_clear":
+        ids = instance.__dict__.pop("_cleared_match_ids", [])
+    else:
+        ids = pk_set or []
+    if ids:
+        refresh_matches_on_commit(**{f"{side}_ids": ids})
+
+
+@receiver(pre_delete, sender=Skill)
+def collect_skill_matches(sender, instance, **kwargs):
+    """Deleting a skill drops its m2m links without m2m_changed; note who had it first."""
+    instance._deleted_match_ids = {
+        "job_ids": list(Job.objects.filter(
+            Q(required_skills=instance) | Q(preferred_skills=instance)
+        ).values_list("pk", flat=True).distinct()),
+        "candidate_ids": list(instance.jobseekers.values_list("pk", flat=True)),
+    }
+
+
+@receiver(post_delete, sender=Skill)
+def refresh_deleted_skill_matches(sender, instance, **kwargs):
+    ids = instance.__dict__.pop("_deleted_match_ids", None)
+    if ids and (ids["job_ids"] or ids["candidate_ids"]):
+        refresh_matches_on_commit(**ids)
+
+
+@receiver(post_save, sender=Job)
+def drop_moved_job_commutes(sender, instance, created, update_fields=None, **kwargs):
+    """
+    When a job's coordinates change, its precomputed commutes no longer apply.
+    `manage.py precompute_commutes` fills them in again for the new location.
+    """
+    if created:
+        return
+    if update_fields is not None and not {"latitude", "longitude"} & set(update_fields):
+        return
+
+    stale = PrecomputedCommute.objects.filter(job=instance)
+    if instance.latitude is not None and instance.longitude is not None:
+        stale = stale.exclude(dest_lat=instance.latitude, dest_lng=instance.longitude)
+    stale.delete()
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using="default", apps=None, **kwargs):
+    """
+    SQLite drops a table's triggers when a migration rebuilds it, so make sure the
+    full-text index and its triggers still exist after every migrate (re-indexing if not).
+    """
+    if sender.name != "jobs":
+        return
+    try:
+        if apps is not None:
+            apps.get_model("jobs", "JobSearchDocument")
+    except LookupError:
+        return  # migrated back to before the index existed
+    if install_search_index(connections[using]):
+        print("Rebuilt the job search index.")
@@ -18,7 +18,14 @@ urlpatterns = [
     # Job seeker: list and search jobs
     path("", views.index, name="index"),
 
-    path('my-jobs/<int:job_id>/applicants/', views.view_applicants, name='view_applicants')
+    path('my-jobs/<int:job_id>/applicants/', views.view_applicants, name='view_applicants'),
+    path('my-jobs/<int:job_id>/applicants/markers/', views.applicant_markers, name='applicant_markers'),
+
+    # Map markers for the jobs index viewport
+    path("api/markers/", views.job_markers, name="job_markers"),
+
+    # Batch geocoding through the shared geocode cache (map pages)
+    path("api/geocode/", views.geocode_batch, name="geocode_batch"),
 
 ]
 
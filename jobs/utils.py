@@ -1,10 +1,25 @@
 # For models and views
+import base64
+import hashlib
+import json
 import math
 import os
-import json
-import urllib.parse
-import urllib.request
+import random
+import re
+import unicodedata
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from django.conf import settings
 from django.core.cache import cache
+from django.db import connection
+from django.utils.module_loading import import_string
+from .http_client import maps_get
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch_haversine falls back to a plain loop
+    np = None
 
 # Calculate radius between lat/long points
 def haversine(lon1, lat1, lon2, lat2):
@@ -18,13 +33,274 @@ def haversine(lon1, lat1, lon2, lat2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return R * c
 
+# Distances from one origin to many points in a single vectorized pass
+def batch_haversine(origin_lat, origin_lng, lats, lngs, radius=None):
+    """
+    Return (distances, mask) for every (lats[i], lngs[i]) point.
+    Missing coordinates (None/NaN) get a NaN distance and are never inside the radius.
+    mask is all True when radius is None.
+    """
+    if np is None:
+        distances = [
+            haversine(origin_lng, origin_lat, lng, lat) if lat is not None and lng is not None else float("nan")
+            for lat, lng in zip(lats, lngs)
+        ]
+        if radius is None:
+            mask = [d == d for d in distances]
+        else:
+            mask = [d <= radius for d in distances]
+        return distances, mask
+
+    R = 3958.8  # miles
+    lat2 = np.radians(np.ascontiguousarray(lats, dtype=np.float64))
+    lng2 = np.radians(np.ascontiguousarray(lngs, dtype=np.float64))
+    lat1 = math.radians(float(origin_lat))
+    lng1 = math.radians(float(origin_lng))
+
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2.0) ** 2
+    distances = 2.0 * R * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    if radius is None:
+        mask = ~np.isnan(distances)
+    else:
+        mask = distances <= float(radius)
+    return distances, mask
+
+# Fixed-size lat/lng grid cells (~7 miles of latitude), e.g. for per-area commute calibration
+GRID_CELL_DEGREES = 0.1
+MILES_PER_DEGREE_LAT = 69.0
+
+def grid_cell(lat, lng):
+    """Return the (row, col) grid cell containing a lat/lng point."""
+    return (
+        math.floor(float(lat) / GRID_CELL_DEGREES),
+        math.floor(float(lng) / GRID_CELL_DEGREES),
+    )
+
+def bounding_box(lat, lng, radius_miles):
+    """
+    Return ((lat_min, lat_max), (lng_min, lng_max)), the lat/lng box that fully
+    contains a circle of radius_miles around lat/lng.
+    """
+    lat, lng, radius_miles = float(lat), float(lng), float(radius_miles)
+    dlat = radius_miles / MILES_PER_DEGREE_LAT
+    # Longitude degrees shrink towards the poles; clamp so the span stays finite
+    cos_lat = max(math.cos(math.radians(min(abs(lat) + dlat, 90.0))), 0.01)
+    dlng = min(radius_miles / (MILES_PER_DEGREE_LAT * cos_lat), 180.0)
+    return (lat - dlat, lat + dlat), (lng - dlng, lng + dlng)
+
+# Geohash of a lat/lng point; longer hashes are smaller cells (7 chars ~ 150 m, 6 ~ 1 km)
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def geohash(lat, lng, precision=7):
+    lat, lng = float(lat), float(lng)
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, use_lng = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if use_lng else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            bounds[0] = mid
+        else:
+            bits = bits * 2
+            bounds[1] = mid
+        use_lng = not use_lng
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+# Canonical form of an address string, used as the geocode cache key
+def normalize_address(address):
+    text = unicodedata.normalize("NFKC", address or "").lower()
+    text = re.sub(r"[^\w\s,#-]", " ", text)
+    text = re.sub(r"\s*,\s*", ", ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip(" ,")[:255]
+
+# Location text marking a job as remote (matched anywhere in the normalized location)
+REMOTE_LOCATION_TERMS = ("remote", "work from home", "wfh", "anywhere")
+
+def is_remote_location(location):
+    text = normalize_address(location)
+    return any(term in text for term in REMOTE_LOCATION_TERMS)
+
+# Opaque pagination cursors: a kind tag plus the sort-key values of the last row shown
+def encode_cursor(kind, *values):
+    payload = json.dumps([kind, *values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(token, kind):
+    """Return the values of a cursor made by encode_cursor(kind, ...), or None if it is missing, malformed or of another kind."""
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, list) or not payload or payload[0] != kind:
+        return None
+    return payload[1:]
+
+# Circuit breaker whose state lives in CACHES["default"]: per process with the default
+# LocMemCache, shared by every worker process when that is a shared backend (Redis, Memcached)
+class CircuitOpenError(RuntimeError):
+    pass
+
+class CircuitBreaker:
+    """
+    Closed: calls go through and consecutive failures are counted.
+    Open: after `failure_threshold` failures, calls are rejected for `cooldown` seconds.
+    Half-open: once the cooldown passes, one probe call at a time is let through;
+    a success closes the circuit, a failure re-opens it for another cooldown.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name, failure_threshold=5, cooldown=60.0, probe_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe_timeout = probe_timeout
+        self.failures_key = f"breaker:{name}:failures"
+        self.open_until_key = f"breaker:{name}:open_until"
+        self.probe_key = f"breaker:{name}:probe"
+
+    @property
+    def state(self):
+        open_until = cache.get(self.open_until_key)
+        if open_until is None:
+            return self.CLOSED
+        return self.OPEN if time.time() < open_until else self.HALF_OPEN
+
+    def allow(self):
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        # Half-open: whoever adds the probe key first gets to send the probe
+        return cache.add(self.probe_key, True, timeout=self.probe_timeout)
+
+    def record_success(self):
+        # Healthy circuit: nothing stored, so nothing to write on the hot path
+        keys = [self.failures_key, self.open_until_key, self.probe_key]
+        if cache.get_many(keys):
+            cache.delete_many(keys)
+
+    def record_failure(self):
+        if cache.get(self.open_until_key) is not None:
+            # A failed half-open probe re-opens the circuit
+            self._open()
+            return
+        cache.add(self.failures_key, 0, timeout=max(self.cooldown * 10, 600))
+        try:
+            failures = cache.incr(self.failures_key)
+        except ValueError:
+            failures = 1
+            cache.set(self.failures_key, failures, timeout=max(self.cooldown * 10, 600))
+        if failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        cache.set(self.open_until_key, time.time() + self.cooldown, timeout=max(self.cooldown * 10, 600))
+        cache.delete_many([self.failures_key, self.probe_key])
+
+
+distance_matrix_breaker = CircuitBreaker(
+    "distance_matrix",
+    failure_threshold=getattr(settings, "DISTANCE_MATRIX_BREAKER_THRESHOLD", 5),
+    cooldown=getattr(settings, "DISTANCE_MATRIX_BREAKER_COOLDOWN_SECONDS", 60.0),
+)
+
+# Single-flight: concurrent callers doing the same work wait for one of them to finish.
+# Within a process followers wait on the leader's Event; across processes the leader
+# holds a cache lock and the others poll for the result it publishes.
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self, name, lock_timeout=30.0, poll_interval=0.05):
+        self.name = name
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, fn, poll=None, wait=None):
+        """
+        Run fn() once for all concurrent callers with the same key. Returns (value, shared),
+        where shared is True if the value came from another caller's fn().
+        poll() picks up a result published by a leader in another process (None if not
+        there yet). Callers that wait longer than `wait` seconds run fn() themselves.
+        """
+        if wait is None:
+            wait = self.lock_timeout
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.event.wait(wait) and flight.error is None:
+                return flight.value, True
+            return fn(), False
+
+        try:
+            flight.value, shared = self._lead(key, fn, poll, wait)
+            return flight.value, shared
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _lead(self, key, fn, poll, wait):
+        lock_key = f"flight:{self.name}:{key}"
+        if cache.add(lock_key, True, timeout=self.lock_timeout):
+            try:
+                return fn(), False
+            finally:
+                cache.delete(lock_key)
+
+        # Another process is fetching: wait for its result, or for its lock to go away
+        if poll is not None:
+            give_up = time.monotonic() + wait
+            while time.monotonic() < give_up:
+                time.sleep(self.poll_interval)
+                value = poll()
+                if value is not None:
+                    return value, True
+                if cache.get(lock_key) is None:
+                    break
+        return fn(), False
+
+
+commute_flights = SingleFlight(
+    "commute",
+    lock_timeout=getattr(settings, "DISTANCE_MATRIX_DEADLINE_SECONDS", 10.0) + 5,
+)
+
+# Top-level Distance Matrix statuses that mean the service itself is unavailable to us
+DISTANCE_MATRIX_OUTAGE_STATUSES = {"OVER_QUERY_LIMIT", "OVER_DAILY_LIMIT", "REQUEST_DENIED", "UNKNOWN_ERROR"}
+
 # Calling Distance Matrix API
-def _distance_matrix_request(origins, destinations, *, use_traffic=True, traffic_model="best_guess", units="imperial", timeout=7.0):
+DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+DISTANCE_MATRIX_TIMEOUT = 7.0
+
+def _distance_matrix_request(origins, destinations, *, use_traffic=True, traffic_model="best_guess", units="imperial", timeout=DISTANCE_MATRIX_TIMEOUT):
     api_key = os.environ.get("GOOGLE_MAPS_API_KEY")
     if not api_key:
         raise RuntimeError("Missing GOOGLE_MAPS_API_KEY")
+    if not distance_matrix_breaker.allow():
+        raise CircuitOpenError("Distance Matrix circuit open")
 
-    base_url = "https://maps.googleapis.com/maps/api/distancematrix/json"
+    base_url = getattr(settings, "GOOGLE_MAPS_DISTANCE_MATRIX_URL", DISTANCE_MATRIX_URL)
     params = {
         "origins": "|".join(origins),
         "destinations": "|".join(destinations),
@@ -36,22 +312,157 @@ def _distance_matrix_request(origins, destinations, *, use_traffic=True, traffic
         params["departure_time"] = "now"
         params["traffic_model"] = traffic_model
 
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
+    # No HTTP-level retries: each call has to fit in the search's deadline
+    # (DISTANCE_MATRIX_DEADLINE_SECONDS); a failed call falls back to the local estimate instead
+    try:
+        payload = maps_get(base_url, params=params, timeout=timeout, retries=False).json()
+    except Exception:
+        distance_matrix_breaker.record_failure()
+        raise
+
+    if payload.get("status") in DISTANCE_MATRIX_OUTAGE_STATUSES:
+        distance_matrix_breaker.record_failure()
+    else:
+        distance_matrix_breaker.record_success()
+    return payload
+
+# Commute results are cached per (origin cell, destination cell), so nearby lookups share
+# an entry. Cell sizes are geohash lengths per traffic mode (settings.COMMUTE_CACHE_PRECISION);
+# a mode missing there uses ~150 m cells at both ends.
+FALLBACK_COMMUTE_CACHE_PRECISION = {"origin": 7, "destination": 7}
+
+def commute_mode(use_traffic):
+    return "traffic" if use_traffic else "no_traffic"
+
+def commute_cache_key(origin_lat, origin_lng, dest_lat, dest_lng, *, use_traffic=True, traffic_model="best_guess",
+                      precision=None):
+    mode = commute_mode(use_traffic)
+    if precision is None:
+        precision = getattr(settings, "COMMUTE_CACHE_PRECISION", {}).get(mode, FALLBACK_COMMUTE_CACHE_PRECISION)
+    origin = geohash(origin_lat, origin_lng, precision["origin"])
+    dest = geohash(dest_lat, dest_lng, precision["destination"])
+    model = traffic_model if use_traffic else "-"
+    return f"commute:{mode}:{model}:{origin}:{dest}"
+
+# Commute cache TTLs (seconds): live traffic goes stale quickly, fallbacks are retried sooner
+COMMUTE_TTL_TRAFFIC = 5*60
+COMMUTE_TTL_NO_TRAFFIC = 60*60
+COMMUTE_TTL_FALLBACK = 15*60
+
+# Cached commutes carry their own expiry time. Past it they are still served for a while
+# (settings.COMMUTE_CACHE_STALE_FRACTION of the TTL) while one caller refreshes them in
+# the background, and each read may refresh a little early with a probability that rises
+# towards expiry (XFetch), so popular pairs don't all expire and refetch at once.
+def _commute_entry(result, ttl, delta):
+    return {"result": result, "expires": time.time() + ttl, "delta": delta}
+
+def _entry_result(entry):
+    return entry.get("result") if isinstance(entry, dict) and "expires" in entry else None
+
+def _jittered_ttl(ttl):
+    jitter = getattr(settings, "COMMUTE_CACHE_TTL_JITTER", 0.1)
+    return ttl * random.uniform(1 - jitter, 1 + jitter)
+
+def _store_commutes(results, ttl, delta):
+    """Cache {cache_key: result} with one set_many; delta is how long the fetch took (seconds)."""
+    ttl = _jittered_ttl(ttl)
+    stale_fraction = getattr(settings, "COMMUTE_CACHE_STALE_FRACTION", 0.5)
+    cache.set_many(
+        {ck: _commute_entry(res, ttl, delta) for ck, res in results.items()},
+        ttl * (1 + stale_fraction),
+    )
+
+def _needs_refresh(entry, now):
+    beta = getattr(settings, "COMMUTE_CACHE_EARLY_REFRESH_BETA", 1.0)
+    # -log(u) for u in (0, 1] is an exponential draw; the wait before expiry it buys scales with delta
+    return now - entry["delta"] * beta * math.log(1.0 - random.random()) >= entry["expires"]
+
+_commute_cache_lock = threading.Lock()
+_commute_cache_stats = {"calls": 0, "round_trips": 0, "hits": 0, "misses": 0, "api_elements": 0, "coalesced": 0,
+                        "stale_hits": 0, "refreshes": 0}
+_commute_mode_stats = {}
+
+
+def _record_commute_cache(mode, round_trips, hits, misses, api_elements, coalesced=False, stale_hits=0, refreshes=0):
+    with _commute_cache_lock:
+        _commute_cache_stats["coalesced"] += int(coalesced)
+        _commute_cache_stats["stale_hits"] += stale_hits
+        _commute_cache_stats["refreshes"] += refreshes
+        _commute_cache_stats["calls"] += 1
+        _commute_cache_stats["round_trips"] += round_trips
+        _commute_cache_stats["hits"] += hits
+        _commute_cache_stats["misses"] += misses
+        _commute_cache_stats["api_elements"] += api_elements
+        per_mode = _commute_mode_stats.setdefault(mode, {"hits": 0, "misses": 0})
+        per_mode["hits"] += hits
+        per_mode["misses"] += misses
+
+
+def _hit_rate(hits, misses):
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def commute_cache_stats():
+    """
+    Snapshot of the process-wide commute cache counters: round-trips per call,
+    overall and per-traffic-mode hit rates, Distance Matrix elements requested, calls
+    whose misses were served by another caller's in-flight fetch, hits served past
+    their expiry, and background refreshes started.
+    """
+    with _commute_cache_lock:
+        stats = dict(_commute_cache_stats)
+        by_mode = {mode: dict(counts) for mode, counts in _commute_mode_stats.items()}
+    calls = stats["calls"]
+    stats["round_trips_per_call"] = stats["round_trips"] / calls if calls else 0.0
+    stats["hit_rate"] = _hit_rate(stats["hits"], stats["misses"])
+    for counts in by_mode.values():
+        counts["hit_rate"] = _hit_rate(counts["hits"], counts["misses"])
+    stats["by_mode"] = by_mode
+    return stats
+
+
+def reset_commute_cache_stats():
+    with _commute_cache_lock:
+        for key in _commute_cache_stats:
+            _commute_cache_stats[key] = 0
+        _commute_mode_stats.clear()
 
-    req = urllib.request.Request(url, headers={"User-Agent": "GTJobSearch/1.0"})
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read().decode("utf-8"))
 
 # Find road distance and time between 2 points
 def get_road_distance_and_time(origin_lat, origin_lng, dest_lat, dest_lng, *, use_traffic=True, traffic_model="best_guess"):
-    # Cache key (rounded coords help reduce cardinality)
-    cache_key = None
-    if cache:
-        cache_key = f"dm1:{round(float(origin_lat),4)},{round(float(origin_lng),4)}->{round(float(dest_lat),4)},{round(float(dest_lng),4)}:{use_traffic}:{traffic_model}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+    # Shares entries with batch_road_distance_and_time (see commute_cache_key)
+    mode = commute_mode(use_traffic)
+    cache_key = commute_cache_key(origin_lat, origin_lng, dest_lat, dest_lng,
+                                  use_traffic=use_traffic, traffic_model=traffic_model)
+    entry = cache.get(cache_key)
+    cached = _entry_result(entry)
+    if cached:
+        now = time.time()
+        refreshed = _needs_refresh(entry, now) and _refresh_in_background(
+            origin_lat, origin_lng, [(dest_lat, dest_lng, cache_key, [])],
+            use_traffic=use_traffic, traffic_model=traffic_model,
+        )
+        _record_commute_cache(mode, 1 + (2 if refreshed else 0), 1, 0, 0,
+                              stale_hits=int(now >= entry["expires"]), refreshes=int(bool(refreshed)))
+        return cached
+
+    polls = [0]
+    def poll():
+        polls[0] += 1
+        return _entry_result(cache.get(cache_key))
+
+    result, shared = commute_flights.do(
+        cache_key,
+        lambda: _fetch_pair(origin_lat, origin_lng, dest_lat, dest_lng, cache_key,
+                            use_traffic=use_traffic, traffic_model=traffic_model),
+        poll=poll, wait=DISTANCE_MATRIX_TIMEOUT + 1,
+    )
+    _record_commute_cache(mode, 1 + polls[0] + (0 if shared else 3), 0, 1, 0 if shared else 1, coalesced=shared)
+    return result
 
+# One Distance Matrix element, cached; falls back to a local estimate on any failure
+def _fetch_pair(origin_lat, origin_lng, dest_lat, dest_lng, cache_key, *, use_traffic, traffic_model):
+    started = time.monotonic()
     try:
         payload = _distance_matrix_request(
             [f"{origin_lat},{origin_lng}"],
@@ -77,94 +488,362 @@ def get_road_distance_and_time(origin_lat, origin_lng, dest_lat, dest_lng, *, us
             "duration_in_traffic_minutes": duration_traf_s / 60.0 if duration_traf_s is not None else None,
             "error": None
         }
-        if cache and cache_key:
-            ttl = 5*60 if use_traffic else 60*60
-            cache.set(cache_key, result, ttl)
+        ttl = COMMUTE_TTL_TRAFFIC if use_traffic else COMMUTE_TTL_NO_TRAFFIC
+        _store_commutes({cache_key: result}, ttl, time.monotonic() - started)
+        _record_calibration(origin_lat, origin_lng, [(dest_lat, dest_lng, result)])
         return result
 
     except Exception as e:
-        # Fallback: rough estimate using haversine @ ~30mph
-        miles = haversine(origin_lng, origin_lat, dest_lng, dest_lat)
-        fallback_minutes = (miles / 30.0) * 60.0
-        result = {
-            "status": "FALLBACK",
-            "distance_miles": miles,
-            "duration_minutes": fallback_minutes,
-            "duration_in_traffic_minutes": None,
-            "error": str(e)
-        }
-        if cache and cache_key:
-            cache.set(cache_key, result, 15*60)
+        # Fallback: local estimate (see CalibratedCommuteBackend)
+        result = _fallback_estimates(origin_lat, origin_lng, [(dest_lat, dest_lng, 0)], use_traffic, e)[0]
+        _store_commutes({cache_key: result}, COMMUTE_TTL_FALLBACK, time.monotonic() - started)
         return result
 
-# Compute road dist/time now from one place to many other locations 
-def batch_road_distance_and_time(origin_lat, origin_lng, destinations, *, use_traffic=True, traffic_model="best_guess"):
-    # Build cache hits/misses
-    to_fetch = []
-    results = {}
+# Compute road dist/time now from one place to many other locations.
+# The cache is read with one get_many and written with one set_many per TTL class, so the
+# round-trips per search don't grow with the number of destinations (misses add the
+# single-flight lock, or the polls of a search waiting on someone else's fetch).
+def batch_road_distance_and_time(origin_lat, origin_lng, destinations, *, use_traffic=True, traffic_model="best_guess",
+                                 max_concurrency=None, deadline=None):
+    keys = {
+        ident: commute_cache_key(origin_lat, origin_lng, dlat, dlng, use_traffic=use_traffic, traffic_model=traffic_model)
+        for (dlat, dlng, ident) in destinations
+    }
 
+    round_trips = 0
+    cached = {}
+    if keys:
+        cached = cache.get_many(set(keys.values()))
+        round_trips += 1
+
+    # Misses are grouped by cache key: destinations in the same cell are fetched once.
+    # Hits that are due for a refresh are still served, and refetched in the background.
+    results = {}
+    pending = {}
+    refresh = {}
+    stale_hits = 0
+    now = time.time()
     for (dlat, dlng, ident) in destinations:
-        ck = None
-        if cache:
-            ck = f"dmN:{round(float(origin_lat),4)},{round(float(origin_lng),4)}->{round(float(dlat),4)},{round(float(dlng),4)}:{use_traffic}:{traffic_model}"
-            cached = cache.get(ck)
-            if cached:
-                results[ident] = cached
-                continue
-        to_fetch.append((dlat, dlng, ident, ck))
+        ck = keys[ident]
+        entry = cached.get(ck)
+        hit = _entry_result(entry)
+        if hit:
+            results[ident] = hit
+            if ck not in refresh and _needs_refresh(entry, now):
+                refresh[ck] = (dlat, dlng, ck, [])
+                stale_hits += int(now >= entry["expires"])
+        else:
+            pending.setdefault(ck, (dlat, dlng, ck, []))[3].append(ident)
+    hits = len(results)
+
+    if max_concurrency is None:
+        max_concurrency = getattr(settings, "DISTANCE_MATRIX_MAX_CONCURRENCY", 4)
+    if deadline is None:
+        deadline = getattr(settings, "DISTANCE_MATRIX_DEADLINE_SECONDS", 10.0)
+
+    # Identical concurrent searches (same missing cells) share one fetch
+    fetched = {}
+    api_elements = 0
+    shared = False
+    if pending:
+        missing = sorted(pending)
+        polls = [0]
+        def poll():
+            polls[0] += 1
+            found = {ck: _entry_result(entry) for ck, entry in cache.get_many(missing).items()}
+            found = {ck: res for ck, res in found.items() if res}
+            return (found, 0) if len(found) == len(missing) else None
 
+        (fetched, write_trips), shared = commute_flights.do(
+            hashlib.sha1("|".join(missing).encode("utf-8")).hexdigest(),
+            lambda: _fetch_and_store(
+                origin_lat, origin_lng, list(pending.values()),
+                use_traffic=use_traffic, traffic_model=traffic_model,
+                max_concurrency=max_concurrency, deadline=deadline,
+            ),
+            poll=poll, wait=deadline + 1,
+        )
+        # Leaders also pay for the lock's add and delete
+        round_trips += polls[0] + (0 if shared else write_trips + 2)
+        api_elements = 0 if shared else len(pending)
+
+    for ck, (_, _, _, idents) in pending.items():
+        for ident in idents:
+            results[ident] = fetched[ck]
+
+    refreshed = bool(refresh) and _refresh_in_background(
+        origin_lat, origin_lng, list(refresh.values()), use_traffic=use_traffic, traffic_model=traffic_model
+    )
+    if refreshed:
+        round_trips += 2  # the refresh lock's add and delete
+
+    _record_commute_cache(commute_mode(use_traffic), round_trips, hits, len(destinations) - hits, api_elements,
+                          coalesced=shared, stale_hits=stale_hits, refreshes=int(refreshed))
+    return {ident: results[ident] for (_, _, ident) in destinations if ident in results}
+
+# Fetch (dlat, dlng, cache_key, idents) entries and cache the results with one set_many per TTL class.
+# Returns ({cache_key: result}, cache round-trips used). Background refreshes pass
+# store_fallbacks=False so an API failure never replaces a real answer with an estimate.
+def _fetch_and_store(origin_lat, origin_lng, to_fetch, *, use_traffic, traffic_model, max_concurrency, deadline,
+                     store_fallbacks=True):
+    started = time.monotonic()
     # Google allows many destinations in one call (commonly up to 25 according to sources)
     chunk_size = 25
-    for i in range(0, len(to_fetch), chunk_size):
-        chunk = to_fetch[i:i+chunk_size]
-        if not chunk:
+    chunks = [to_fetch[i:i+chunk_size] for i in range(0, len(to_fetch), chunk_size)]
+    fetched = _dispatch_chunks(
+        origin_lat, origin_lng, chunks,
+        use_traffic=use_traffic, traffic_model=traffic_model,
+        max_concurrency=max_concurrency, deadline=deadline,
+    )
+
+    results = {}
+    ok_ttl = COMMUTE_TTL_TRAFFIC if use_traffic else COMMUTE_TTL_NO_TRAFFIC
+    writes = {ok_ttl: {}, COMMUTE_TTL_FALLBACK: {}}
+    samples = []
+    for chunk, (chunk_results, error) in zip(chunks, fetched):
+        if error is None:
+            for (dlat, dlng, ck, _), res in zip(chunk, chunk_results):
+                results[ck] = res
+                writes[ok_ttl][ck] = res
+                samples.append((dlat, dlng, res))
             continue
 
-        dest_strings = [f"{dlat},{dlng}" for (dlat, dlng, _, _) in chunk]
+        # Fallback for the whole chunk
+        estimates = _fallback_estimates(
+            origin_lat, origin_lng, [(dlat, dlng, ck) for (dlat, dlng, ck, _) in chunk], use_traffic, error
+        )
+        for ck, res in estimates.items():
+            results[ck] = res
+            writes[COMMUTE_TTL_FALLBACK][ck] = res
+
+    _record_calibration(origin_lat, origin_lng, samples)
+    if not store_fallbacks:
+        del writes[COMMUTE_TTL_FALLBACK]
+    delta = time.monotonic() - started
+    round_trips = 0
+    for ttl, entries in writes.items():
+        if entries:
+            _store_commutes(entries, ttl, delta)
+            round_trips += 1
+    return results, round_trips
+
+_refresh_pool = None
+_refresh_pool_lock = threading.Lock()
+
+def _refresh_in_background(origin_lat, origin_lng, to_refresh, *, use_traffic, traffic_model):
+    """
+    Refetch (dlat, dlng, cache_key, idents) entries on a background thread. A cache lock
+    makes sure only one process refreshes a given set of keys; returns False when
+    someone else already is.
+    """
+    global _refresh_pool
+    deadline = getattr(settings, "DISTANCE_MATRIX_DEADLINE_SECONDS", 10.0)
+    keys = sorted(ck for (_, _, ck, _) in to_refresh)
+    lock_key = "commute-refresh:" + hashlib.sha1("|".join(keys).encode("utf-8")).hexdigest()
+    if not cache.add(lock_key, True, timeout=deadline + 5):
+        return False
+
+    def run():
         try:
-            payload = _distance_matrix_request(
-                [f"{origin_lat},{origin_lng}"], dest_strings,
-                use_traffic=use_traffic, traffic_model=traffic_model
+            _fetch_and_store(
+                origin_lat, origin_lng, to_refresh,
+                use_traffic=use_traffic, traffic_model=traffic_model,
+                max_concurrency=getattr(settings, "DISTANCE_MATRIX_MAX_CONCURRENCY", 4),
+                deadline=deadline, store_fallbacks=False,
             )
-            ok = payload.get("status") == "OK"
-            rows = payload.get("rows", [])
-            if not ok or not rows:
-                raise RuntimeError(payload.get("error_message") or payload.get("status"))
-
-            elems = rows[0].get("elements", [])
-            for (item, elem) in zip(chunk, elems):
-                dlat, dlng, ident, ck = item
-                if elem.get("status") != "OK":
-                    raise RuntimeError(elem.get("status"))
-                distance_m = elem.get("distance", {}).get("value")
-                duration_s = elem.get("duration", {}).get("value")
-                duration_traf_s = elem.get("duration_in_traffic", {}).get("value") if use_traffic else None
-                res = {
-                    "status": "OK",
-                    "distance_miles": distance_m/1609.344 if distance_m is not None else None,
-                    "duration_minutes": duration_s/60.0 if duration_s is not None else None,
-                    "duration_in_traffic_minutes": duration_traf_s/60.0 if duration_traf_s is not None else None,
-                    "error": None
-                }
-                results[ident] = res
-                if cache and ck:
-                    ttl = 5*60 if use_traffic else 60*60
-                    cache.set(ck, res, ttl)
+        except Exception as e:
+            print(f"Commute cache refresh failed: {e}")
+        finally:
+            cache.delete(lock_key)
+            connection.close()
+
+    with _refresh_pool_lock:
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, "COMMUTE_CACHE_REFRESH_WORKERS", 2),
+                thread_name_prefix="commute-refresh",
+            )
+    _refresh_pool.submit(run)
+    return True
+
+# One Distance Matrix call for a chunk of destinations; raises on any failure
+def _fetch_chunk(origin_lat, origin_lng, chunk, *, use_traffic, traffic_model, timeout):
+    dest_strings = [f"{dlat},{dlng}" for (dlat, dlng, _, _) in chunk]
+    payload = _distance_matrix_request(
+        [f"{origin_lat},{origin_lng}"], dest_strings,
+        use_traffic=use_traffic, traffic_model=traffic_model, timeout=timeout
+    )
+    ok = payload.get("status") == "OK"
+    rows = payload.get("rows", [])
+    if not ok or not rows:
+        raise RuntimeError(payload.get("error_message") or payload.get("status"))
 
+    chunk_results = []
+    elems = rows[0].get("elements", [])
+    if len(elems) != len(chunk):
+        raise RuntimeError("Distance Matrix returned %d elements for %d destinations" % (len(elems), len(chunk)))
+    for elem in elems:
+        if elem.get("status") != "OK":
+            raise RuntimeError(elem.get("status"))
+        distance_m = elem.get("distance", {}).get("value")
+        duration_s = elem.get("duration", {}).get("value")
+        duration_traf_s = elem.get("duration_in_traffic", {}).get("value") if use_traffic else None
+        chunk_results.append({
+            "status": "OK",
+            "distance_miles": distance_m/1609.344 if distance_m is not None else None,
+            "duration_minutes": duration_s/60.0 if duration_s is not None else None,
+            "duration_in_traffic_minutes": duration_traf_s/60.0 if duration_traf_s is not None else None,
+            "error": None
+        })
+    return chunk_results
+
+# Fire chunk requests (up to max_concurrency at once) under one overall deadline.
+# Returns [(chunk_results, error)] aligned with chunks; chunks still running at the deadline get an error.
+def _dispatch_chunks(origin_lat, origin_lng, chunks, *, use_traffic, traffic_model, max_concurrency, deadline):
+    if not chunks:
+        return []
+    started = time.monotonic()
+
+    def run(chunk):
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            return None, TimeoutError("Distance Matrix deadline exceeded")
+        try:
+            return _fetch_chunk(
+                origin_lat, origin_lng, chunk,
+                use_traffic=use_traffic, traffic_model=traffic_model,
+                timeout=min(DISTANCE_MATRIX_TIMEOUT, remaining),
+            ), None
         except Exception as e:
-            # Fallback for the whole chunk
-            for (dlat, dlng, ident, ck) in chunk:
-                miles = haversine(origin_lng, origin_lat, dlng, dlat)
-                fallback_minutes = (miles/30.0)*60.0
-                res = {
-                    "status": "FALLBACK",
-                    "distance_miles": miles,
-                    "duration_minutes": fallback_minutes,
-                    "duration_in_traffic_minutes": None,
-                    "error": str(e)
-                }
-                results[ident] = res
-                if cache and ck:
-                    cache.set(ck, res, 15*60)
-
-    return results
\ No newline at end of file
+            return None, e
+
+    if max_concurrency <= 1 or len(chunks) == 1:
+        return [run(chunk) for chunk in chunks]
+
+    pool = ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks)), thread_name_prefix="distance-matrix")
+    try:
+        futures = [pool.submit(run, chunk) for chunk in chunks]
+        done, _ = wait(futures, timeout=max(deadline - (time.monotonic() - started), 0))
+        return [
+            f.result() if f in done else (None, TimeoutError("Distance Matrix deadline exceeded"))
+            for f in futures
+        ]
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+
+# Commute backends: interchangeable ways of answering "how far / how long from here to each
+# of these places". settings.COMMUTE_BACKEND picks the one used by the radius searches.
+class CommuteBackend:
+    """
+    estimate_many() takes destinations as (lat, lng, ident) and returns {ident: result},
+    each result a dict with status, distance_miles, duration_minutes,
+    duration_in_traffic_minutes and error (the shape batch_road_distance_and_time returns).
+    """
+
+    def estimate_many(self, origin_lat, origin_lng, destinations, *, use_traffic=True, traffic_model="best_guess"):
+        raise NotImplementedError
+
+    def estimate(self, origin_lat, origin_lng, dest_lat, dest_lng, **kwargs):
+        return self.estimate_many(origin_lat, origin_lng, [(dest_lat, dest_lng, 0)], **kwargs)[0]
+
+
+class GoogleCommuteBackend(CommuteBackend):
+    """Google Distance Matrix, cached; falls back to the local estimator when the API fails."""
+
+    def estimate_many(self, origin_lat, origin_lng, destinations, *, use_traffic=True, traffic_model="best_guess"):
+        return batch_road_distance_and_time(
+            origin_lat, origin_lng, destinations, use_traffic=use_traffic, traffic_model=traffic_model
+        )
+
+
+class HaversineCommuteBackend(CommuteBackend):
+    """Straight-line distance at a fixed speed; no I/O at all."""
+    circuity = 1.0
+    mph = 30.0
+
+    def profile(self, origin_lat, origin_lng):
+        return {"circuity": self.circuity, "mph": self.mph, "traffic_mph": None}
+
+    def estimate_many(self, origin_lat, origin_lng, destinations, *, use_traffic=True, traffic_model="best_guess"):
+        destinations = list(destinations)
+        if not destinations:
+            return {}
+        profile = self.profile(origin_lat, origin_lng)
+        straight, _ = batch_haversine(
+            origin_lat, origin_lng, [d[0] for d in destinations], [d[1] for d in destinations]
+        )
+        results = {}
+        for (_, _, ident), miles in zip(destinations, straight):
+            road = float(miles) * profile["circuity"]
+            traffic_mph = profile["traffic_mph"] if use_traffic else None
+            results[ident] = {
+                "status": "ESTIMATE",
+                "distance_miles": road,
+                "duration_minutes": road / profile["mph"] * 60.0,
+                "duration_in_traffic_minutes": road / traffic_mph * 60.0 if traffic_mph else None,
+                "error": None,
+            }
+        return results
+
+
+class CalibratedCommuteBackend(HaversineCommuteBackend):
+    """
+    Straight-line distance scaled by the road circuity and average speeds observed in
+    real Distance Matrix results from the origin's grid cell (jobs.models.CommuteCalibration).
+    Uses the defaults of HaversineCommuteBackend until enough results have been seen.
+    """
+    profile_ttl = 10 * 60
+
+    def profile(self, origin_lat, origin_lng):
+        from .models import CommuteCalibration
+
+        row, col = grid_cell(origin_lat, origin_lng)
+        key = f"commute-calibration:{row}:{col}"
+        profile = cache.get(key)
+        if profile is None:
+            min_samples = getattr(settings, "COMMUTE_CALIBRATION_MIN_SAMPLES", 20)
+            try:
+                # Cache "no calibration yet" as {} so it is not looked up on every search
+                profile = CommuteCalibration.profile(origin_lat, origin_lng, min_samples=min_samples) or {}
+            except Exception as e:
+                print(f"Commute calibration lookup failed: {e}")
+                profile = {}
+            cache.set(key, profile, self.profile_ttl)
+        return profile or super().profile(origin_lat, origin_lng)
+
+
+def get_commute_backend():
+    """Instantiate the backend named by settings.COMMUTE_BACKEND."""
+    return import_string(getattr(settings, "COMMUTE_BACKEND", "jobs.utils.GoogleCommuteBackend"))()
+
+
+def estimate_commutes(origin_lat, origin_lng, destinations, *, use_traffic=True, traffic_model="best_guess"):
+    """Commute estimates from the configured backend, {ident: result}."""
+    return get_commute_backend().estimate_many(
+        origin_lat, origin_lng, destinations, use_traffic=use_traffic, traffic_model=traffic_model
+    )
+
+
+# Estimates for destinations the Distance Matrix could not answer, marked as fallbacks
+def _fallback_estimates(origin_lat, origin_lng, destinations, use_traffic, error):
+    estimates = CalibratedCommuteBackend().estimate_many(origin_lat, origin_lng, destinations, use_traffic=use_traffic)
+    for res in estimates.values():
+        res["status"] = "FALLBACK"
+        res["error"] = str(error)
+    return estimates
+
+
+# Feed fresh Distance Matrix results into the local estimator's calibration
+def _record_calibration(origin_lat, origin_lng, samples):
+    from .models import CommuteCalibration
+
+    samples = [(dlat, dlng, res) for (dlat, dlng, res) in samples if res.get("status") == "OK"]
+    if not samples:
+        return
+    straight, _ = batch_haversine(origin_lat, origin_lng, [s[0] for s in samples], [s[1] for s in samples])
+    try:
+        CommuteCalibration.record(origin_lat, origin_lng, [(float(m), res) for m, (_, _, res) in zip(straight, samples)])
+    except Exception as e:
+        print(f"Recording commute calibration failed: {e}")
@@ -2,171 +2,225 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.db.models import Q
 from django.conf import settings
 from django.urls import reverse
-from .models import Job, Skill
-from .utils import haversine, batch_road_distance_and_time
-from django.core.serializers.json import DjangoJSONEncoder
+from .models import JOB_SORTS, GeocodeCache, Job, Skill
+from .commutes import job_commutes
+from .facets import job_facets
+from .geocoding import geocode_many, take_geocode_budget
+from .utils import decode_cursor, encode_cursor, normalize_address
 import json
 from django.contrib.auth.decorators import login_required
 from .forms import JobForm
+from .markers import markers_response
+from .result_cache import cached_query
+from .search import is_ranked, search_jobs
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.views.decorators.http import require_POST
 from accounts.models import RecruiterProfile
 from functools import wraps
 from applications.models import Application
 from accounts.models import JobSeekerProfile
 
-def index(request):
-    pay_type = request.GET.get("pay_type")
-    min_salary = request.GET.get("min_salary")
-    max_salary = request.GET.get("max_salary")
-    skills_filter = request.GET.getlist('skills')  # Get skills filter
-
+def filter_jobs(params):
+    """
+    Jobs matching the search/filter params of the jobs index, and the search origin as
+    (lat, lng, radius in miles) when a radius search was requested (else None).
+    The radius itself is applied by the caller.
+    """
     jobs = Job.objects.all()
 
-    # Name and company filter
-    search = request.GET.get("search")
+    # Full-text search over title, company, description and projects (ranked, see jobs/search.py)
+    search = (params.get("search") or "").strip()
     if search:
-        jobs = jobs.filter(Q(title__icontains=search) | Q(company__icontains=search))
-
+        jobs = search_jobs(jobs, search)
 
     # Pay type filter
-    pay_type = request.GET.get("pay_type")
+    pay_type = params.get("pay_type")
     if pay_type and pay_type != "all":
         jobs = jobs.filter(pay_type=pay_type)
 
-    # Salary filter
-    min_salary = request.GET.get("min_salary")
-    max_salary = request.GET.get("max_salary")
+    # Salary filter, in yearly amounts so hourly/monthly/annual jobs compare (indexed columns)
+    min_salary = params.get("min_salary")
+    max_salary = params.get("max_salary")
     if min_salary:
         try:
-            jobs = jobs.filter(pay_min__gte=float(min_salary))
+            jobs = jobs.filter(annual_pay_min__gte=float(min_salary))
         except ValueError:
             pass
     if max_salary:
         try:
-            jobs = jobs.filter(pay_max__lte=float(max_salary))
+            jobs = jobs.filter(annual_pay_max__lte=float(max_salary))
         except ValueError:
             pass
 
     # Visa sponsorship filter
-    visa = request.GET.get("visa")  # could be "on" if checkbox is checked
+    visa = params.get("visa")  # could be "on" if checkbox is checked
     if visa == "on":
         jobs = jobs.filter(visa_sponsorship=True)
 
     # Filter by skills
+    skills_filter = params.getlist("skills")
     if skills_filter and skills_filter != ['']:
         jobs = jobs.filter(
-            Q(required_skills__name__in=skills_filter) | 
+            Q(required_skills__name__in=skills_filter) |
             Q(preferred_skills__name__in=skills_filter)
         ).distinct()
 
-    # Get all skills for the dropdown
-    all_skills = Skill.objects.all().order_by('name')
-
-    # Radius and location filter (use road distance/time instead of pure haversine)
-    radius = request.GET.get("radius")
-    lat = request.GET.get("lat")
-    lng = request.GET.get("lng")
-    location_text = (request.GET.get("location") or "").strip()
+    # Radius and location filter
+    radius = params.get("radius")
+    lat = params.get("lat")
+    lng = params.get("lng")
+    location_text = (params.get("location") or "").strip()
 
     # Remote location mode (typed in location box)
     remote_tokens = {"remote", "wfh", "work from home", "anywhere", "fully remote", "remote only"}
     is_remote_search = location_text.lower() in remote_tokens
 
-    # Convert queryset to list so we can attach display-only attributes like road_miles / drive_minutes
-    jobs = list(jobs)
-
+    origin = None
     if is_remote_search:
-        # If your model has a boolean is_remote, include it; otherwise, fall back to location text matches
-        remote_q = (
-            Q(location__icontains="remote") |
-            Q(location__icontains="work from home") |
-            Q(location__icontains="wfh") |
-            Q(location__icontains="anywhere")
-        )
-        if hasattr(Job, "is_remote"):
-            remote_q = Q(is_remote=True) | remote_q
-
-        # Filter the *list* based on queryset membership
-        remote_ids = set(Job.objects.filter(remote_q).values_list("id", flat=True))
-        jobs = [j for j in jobs if j.id in remote_ids]
+        # Indexed flag derived from the location text on save
+        jobs = jobs.filter(is_remote=True)
 
         # Skip geo/radius logic entirely when remote mode is on
 
     elif radius and lat and lng:
         try:
-            # Parse numeric inputs
-            radius_f = float(radius)
-            lat_f = float(lat)
-            lng_f = float(lng)
-
-            # Prefiltering with previous haversine formula (basic radius) to save API calls
-            buffer_radius = radius_f * 1.5
-            candidates = []
-            for job in jobs:
-                if job.latitude is None or job.longitude is None:
-                    continue
-                try:
-                    approx = haversine(lng_f, lat_f, float(job.longitude), float(job.latitude))
-                except Exception:
-                    continue
-                if approx <= buffer_radius:
-                    candidates.append(job)
-
-            # Batch road distance/time for remaining (Google Distance Matrix)
-            dests = [(j.latitude, j.longitude, j.pk) for j in candidates]
-            dm_map = batch_road_distance_and_time(
-                lat_f, lng_f, dests, use_traffic=True, traffic_model="best_guess"
-            )
-
-            # Keep only jobs within the requested road radius; attach values for UI
-            filtered = []
-            for job in candidates:
-                dm = dm_map.get(job.pk)
-                if not dm:
-                    continue
-                road_miles = dm.get("distance_miles")
-                if road_miles is None or road_miles > radius_f:
-                    continue
-
-                minutes = dm.get("duration_in_traffic_minutes") or dm.get("duration_minutes")
-                job.road_miles = round(road_miles, 1)
-                job.drive_minutes = round(minutes) if minutes is not None else None
-                filtered.append(job)
-
-            # Sort by road distance, then by drive minutes
-            filtered.sort(key=lambda x: (
-                getattr(x, "road_miles", 1e9),
-                getattr(x, "drive_minutes", 1e9) if getattr(x, "drive_minutes", None) is not None else 1e9,
-            ))
-
-            jobs = filtered
-
+            origin = (float(lat), float(lng), float(radius))
         except ValueError:
             # if bad inputs, skip commute filtering entirely
             pass
 
-    # Markers for map
-    job_markers = []
-    for job in jobs:
-        if job.latitude and job.longitude:
-            marker = {
-                "id": job.id,
-                "lat": float(job.latitude),
-                "lng": float(job.longitude),
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "image_url": job.image.url if job.image else None,
-            }
-            # optionally include road distance/time for future info windows
-            if hasattr(job, "road_miles"):
-                marker["road_miles"] = job.road_miles
-            if hasattr(job, "drive_minutes") and job.drive_minutes is not None:
-                marker["drive_minutes"] = job.drive_minutes
-            job_markers.append(marker)
-
-    job_markers_json = json.dumps(job_markers, cls=DjangoJSONEncoder)
+    return jobs, origin
+
+def job_results(params):
+    """
+    Everything the jobs index shows for the query `params` that does not depend on the
+    viewer: the page of jobs, counts, facets, skills and paging links.
+    """
+    skills_filter = params.getlist('skills')  # Get skills filter
+
+    # The facet counts ignore the pay type filter, so every option shows what it would
+    # return; the listed jobs are the same set with the pay type applied.
+    pay_type = params.get("pay_type")
+    pay_type = pay_type if pay_type and pay_type != "all" else None
+    facet_params = params.copy()
+    facet_params.pop("pay_type", None)
+    facet_jobs, origin = filter_jobs(facet_params)
+    jobs = facet_jobs.filter(pay_type=pay_type) if pay_type else facet_jobs
+
+    # Get all skills for the dropdown
+    all_skills = list(Skill.objects.all().order_by('name'))
+
+    # Set when the radius search ranks jobs by commute
+    ranked = None
+
+    if origin is not None:
+        # Road distance/time instead of pure haversine
+        lat_f, lng_f, radius_f = origin
+
+        # Prefilter in SQL to straight-line distance within 1.5x the radius (indexed
+        # bounding box, then exact haversine), so only nearby jobs are loaded. Every pay
+        # type is kept here, so the facets count the same road-radius set that is listed.
+        buffer_radius = radius_f * 1.5
+        candidates = list(facet_jobs.filter_within_radius(lat_f, lng_f, buffer_radius))
+
+        # Road distance/time for remaining (precomputed for popular origins, else settings.COMMUTE_BACKEND)
+        dm_map = job_commutes(lat_f, lng_f, candidates, use_traffic=True, traffic_model="best_guess")
+
+        # Keep only jobs within the requested road radius; attach values for UI
+        within = []
+        for job in candidates:
+            dm = dm_map.get(job.pk)
+            if not dm:
+                continue
+            road_miles = dm.get("distance_miles")
+            if road_miles is None or road_miles > radius_f:
+                continue
+
+            minutes = dm.get("duration_in_traffic_minutes") or dm.get("duration_minutes")
+            job.road_miles = round(road_miles, 1)
+            job.drive_minutes = round(minutes) if minutes is not None else None
+            within.append(job)
+        facet_jobs = Job.objects.filter(pk__in=[job.pk for job in within])
+        filtered = [job for job in within if pay_type is None or job.pay_type == pay_type]
+
+        # Sort by road distance, then by drive minutes (id keeps the order total for paging)
+        def commute_key(x):
+            return (x.road_miles, x.drive_minutes if x.drive_minutes is not None else 1e9, x.id)
+        filtered.sort(key=commute_key)
+        ranked = filtered
+
+    # Facet counts for the filter sidebar
+    facets = job_facets(params, facet_jobs, pay_type)
+
+    # Top skills link to the same search with that skill added
+    skill_facets = []
+    for facet in facets["skills"]:
+        selected = facet["name"] in skills_filter
+        query = params.copy()
+        query.pop("after", None)
+        if not selected:
+            query.appendlist("skills", facet["name"])
+        skill_facets.append({**facet, "selected": selected, "query": query.urlencode()})
+
+    # Keyset pagination: the cursor holds the sort key of the last job on the previous page
+    page_size = getattr(settings, "JOBS_PAGE_SIZE", 20)
+    after = params.get("after")
+    sort = params.get("sort")
+    if sort not in JOB_SORTS:
+        # Text searches default to best match, everything else to newest first
+        sort = None if is_ranked(jobs) else "newest"
+    if ranked is not None:
+        total_count = len(ranked)
+        cursor = decode_cursor(after, "commute")
+        if cursor is not None:
+            ranked = [job for job in ranked if list(commute_key(job)) > cursor]
+        jobs, has_next = ranked[:page_size], len(ranked) > page_size
+        next_cursor = encode_cursor("commute", *commute_key(jobs[-1])) if has_next else None
+    elif sort is None:
+        # Text search without a location or sort: best match first
+        total_count = jobs.count()
+        jobs, has_next = jobs.search_page(decode_cursor(after, "search"), page_size)
+        next_cursor = encode_cursor("search", jobs[-1].search_rank, jobs[-1].id) if has_next else None
+    else:
+        ordering = JOB_SORTS[sort]
+        total_count = jobs.count()
+        jobs, has_next = jobs.keyset_page(decode_cursor(after, sort), page_size, ordering)
+        next_cursor = encode_cursor(sort, *jobs[-1].keyset_values(ordering)) if has_next else None
+
+    next_page_query = None
+    if next_cursor:
+        query = params.copy()
+        query["after"] = next_cursor
+        next_page_query = query.urlencode()
+    first_page_query = None
+    if after:
+        query = params.copy()
+        query.pop("after", None)
+        first_page_query = query.urlencode()
+
+    return {
+        "jobs": jobs,
+        "total_count": total_count,
+        "next_page_query": next_page_query,
+        "first_page_query": first_page_query,
+        "all_skills": all_skills,
+        "selected_skills": skills_filter,
+        "facets": facets,
+        "sort": sort or "relevance",
+        "skill_facets": skill_facets,
+    }
+
+def index(request):
+    # Anonymous visitors all see the same page for a query, so popular searches (and the
+    # bare landing page) are served from the versioned result cache (jobs/result_cache.py)
+    if request.user.is_authenticated:
+        results = job_results(request.GET)
+    else:
+        results = cached_query(
+            "job-results", request.GET, lambda: job_results(request.GET),
+            getattr(settings, "JOB_RESULTS_CACHE_TTL", 300),
+        )
 
     # Count user's applications if logged in
     user_application_count = 0
@@ -175,33 +229,53 @@ def index(request):
         user_application_count = Application.objects.filter(user=request.user).count()
     
     return render(request, "jobs/index.html", {
-        "jobs": jobs,
-        "all_skills": all_skills,
-        "selected_skills": skills_filter,
-        "job_markers_json": job_markers_json,
+        **results,
         "GOOGLE_MAPS_API_KEY": settings.GOOGLE_MAPS_API_KEY,
         "user_application_count": user_application_count,
     })
 
+def job_marker(job):
+    """Map marker for one job (jobs index info windows)."""
+    return {
+        "id": job.id,
+        "lat": float(job.latitude),
+        "lng": float(job.longitude),
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "image_url": job.image.url if job.image else None,
+    }
+
+# Markers for the jobs index map viewport, with the same filters as the index.
+# A radius search is drawn with its straight-line radius; the road-distance ranking stays on the list.
+# Anonymous responses are cached like the index (the fit-to-results extent and the first
+# viewport after it are the same for every visitor).
+def job_markers(request):
+    def respond():
+        jobs, origin = filter_jobs(request.GET)
+        if origin is not None:
+            jobs = jobs.filter_within_radius(*origin)
+        return markers_response(request, [(jobs, job_marker)])
+
+    if request.user.is_authenticated:
+        return respond()
+    return cached_query("job-markers", request.GET, respond, getattr(settings, "JOB_RESULTS_CACHE_TTL", 300))
+
 # Now just added ability to view distance/time to job based on actual roadtime not basic radius
 def jobs_by_commute_radius(request):
-    user_lat = float(request.GET.get("lat"))
-    user_lng = float(request.GET.get("lng"))
-    radius_miles = float(request.GET.get("radius_miles", 25))
-
-    # prefiltering with previous haversine formula (basic radius)
+    try:
+        user_lat = float(request.GET["lat"])
+        user_lng = float(request.GET["lng"])
+        radius_miles = float(request.GET.get("radius_miles", 25))
+    except (KeyError, ValueError):
+        return HttpResponseBadRequest("lat and lng (and radius_miles, if given) must be numbers")
+
+    # prefiltering with previous haversine formula (basic radius), in SQL
     buffer_radius = radius_miles * 1.5
-    pre = []
-    for job in Job.objects.all():
-        if job.latitude is None or job.longitude is None:
-            continue
-        approx = haversine(user_lng, user_lat, job.longitude, job.latitude)
-        if approx <= buffer_radius:
-            pre.append(job)
+    pre = list(Job.objects.filter_within_radius(user_lat, user_lng, buffer_radius))
 
-    # batch road distance/time for remaining
-    dests = [(j.latitude, j.longitude, j.pk) for j in pre]
-    dm_map = batch_road_distance_and_time(user_lat, user_lng, dests, use_traffic=True, traffic_model="best_guess")
+    # road distance/time for remaining (precomputed for popular origins)
+    dm_map = job_commutes(user_lat, user_lng, pre, use_traffic=True, traffic_model="best_guess")
 
     # filter by road distance
     results = []
@@ -217,10 +291,7 @@ def jobs_by_commute_radius(request):
             results.append(job)
 
     # Sort by road distance, then minutes
-    results.sort(key=lambda x: (
-        getattr(x, "_road_miles", 1e9),
-        getattr(x, "_drive_minutes", 1e9) if getattr(x, "_drive_minutes", None) is not None else 1e9,
-    ))
+    results.sort(key=lambda x: (x.road_miles, x.drive_minutes if x.drive_minutes is not None else 1e9, x.id))
 
     return render(request, "jobs/index.html", {"jobs": results, "user_lat": user_lat, "user_lng": user_lng, "radius_miles": radius_miles})
 
@@ -228,22 +299,25 @@ def show(request, job_id):
     job = get_object_or_404(Job, id=job_id)
 
     recommended = None
+    next_candidates_query = None
 
     # Show recommended candidates only if recruiter owns the job
     if hasattr(request.user, "recruiterprofile") and job.recruiter == request.user.recruiterprofile:
 
-        # Combine required + preferred skills
-        job_skills = list(job.required_skills.all()) + list(job.preferred_skills.all())
-
-        recommended = (
-            JobSeekerProfile.objects
-            .filter(skills__in=job_skills)
-            .distinct()
-        )
+        # Weighted required/preferred skill overlap, best match first, keyset-paginated
+        page_size = getattr(settings, "RECOMMENDATIONS_PAGE_SIZE", 12)
+        after = decode_cursor(request.GET.get("after"), "candidates")
+        recommended, has_next = job.recommended_candidates_page(after, page_size)
+        if has_next:
+            last = recommended[-1]
+            params = request.GET.copy()
+            params["after"] = encode_cursor("candidates", last.match_score, last.required_matches, last.pk)
+            next_candidates_query = params.urlencode()
 
     return render(request, "jobs/job.html", {
         "job": job,
         "recommended": recommended,
+        "next_candidates_query": next_candidates_query,
         "GOOGLE_MAPS_API_KEY": settings.GOOGLE_MAPS_API_KEY,
     })
 
@@ -403,43 +477,73 @@ def view_applicants(request, job_id):
         'closed': applicants.filter(status='closed').count(),
     }
     
-    # Create user markers data for map
-    user_markers = []
-    
-    for application in applicants:
-        user = application.user
-        
-        # Use jobseekerprofile instead of profile
-        if hasattr(user, 'jobseekerprofile'):
-            profile = user.jobseekerprofile
-            
-            # Build location text from available fields
-            location_text = profile.location or profile.full_address or ''
-            
-            # Get coordinates
-            lat = float(profile.latitude) if profile.latitude else None
-            lng = float(profile.longitude) if profile.longitude else None
-            
-            marker_data = {
-                'id': user.id,
-                'name': user.get_full_name() or user.username,
-                'role': 'Job Seeker',
-                'headline': profile.headline or '',
-                'location_text': location_text,
-                'lat': lat,
-                'lng': lng,
-                'profileUrl': reverse('profiles:view_profile', kwargs={'user_id': user.id}),
-                'contactUrl': f'/messages/compose/{user.id}/',
-            }
-            
-            # Add marker if we have location data
-            if location_text or (lat and lng):
-                user_markers.append(marker_data)
-    
     return render(request, 'jobs/applicants_list.html', {
         'job': job,
         'applicants': applicants,
         'status_counts': status_counts,
-        'user_markers_json': json.dumps(user_markers, cls=DjangoJSONEncoder),
         'MAPS_KEY': getattr(settings, 'GOOGLE_MAPS_API_KEY', ''),
-    })
\ No newline at end of file
+    })
+
+def applicant_marker(profile):
+    """Map marker for one applicant's job seeker profile."""
+    user = profile.user
+    return {
+        'id': user.id,
+        'name': user.get_full_name() or user.username,
+        'role': 'Job Seeker',
+        'headline': profile.headline or '',
+        'location_text': profile.location or profile.full_address or '',
+        'lat': float(profile.latitude),
+        'lng': float(profile.longitude),
+        'profileUrl': reverse('profiles:view_profile', kwargs={'user_id': user.id}),
+        'contactUrl': f'/messages/compose/{user.id}/',
+    }
+
+# Map markers for the applicants of one of the recruiter's jobs, for the map viewport
+@recruiter_required
+@login_required
+def applicant_markers(request, job_id):
+    job = get_object_or_404(Job, id=job_id, recruiter=request.user.recruiterprofile)
+    profiles = JobSeekerProfile.objects.filter(user__applications__job=job).select_related('user')
+    return markers_response(request, [(profiles, applicant_marker)])
+
+# Max addresses resolved per geocode_batch call
+GEOCODE_BATCH_LIMIT = 50
+
+# Geocode many addresses in one call through the shared geocode cache (map pages).
+# Cached addresses are free; uncached ones count against the user's geocode budget
+# (settings.GEOCODE_USER_LIMIT) and are listed under "limited" once it is spent.
+@login_required
+@require_POST
+def geocode_batch(request):
+    try:
+        data = json.loads(request.body.decode())
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({"ok": False, "error": "Invalid JSON"}, status=400)
+
+    addresses = data.get("addresses") if isinstance(data, dict) else None
+    if not isinstance(addresses, list):
+        return JsonResponse({"ok": False, "error": "addresses must be a list"}, status=400)
+
+    addresses = list(dict.fromkeys(a.strip() for a in addresses if isinstance(a, str) and a.strip()))
+    addresses = addresses[:GEOCODE_BATCH_LIMIT]
+    results = GeocodeCache.lookup_many(addresses)
+
+    uncached = {}
+    for address in addresses:
+        if address not in results and normalize_address(address):
+            uncached.setdefault(normalize_address(address), []).append(address)
+    granted = list(uncached)[:take_geocode_budget(request.user.pk, len(uncached))]
+    limited = [address for key in list(uncached)[len(granted):] for address in uncached[key]]
+    if granted:
+        fetched, _ = geocode_many([address for key in granted for address in uncached[key]])
+        results.update(fetched)
+
+    return JsonResponse({
+        "ok": True,
+        "results": {
+            address: ({"lat": float(coords[0]), "lng": float(coords[1])} if coords else None)
+            for address, coords in results.items()
+        },
+        "limited": limited,
+    })